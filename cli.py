@@ -6,7 +6,14 @@ from pydantic import ValidationError
 from dotenv import load_dotenv
 load_dotenv()
 
-from multimodal_rag.pipeline.indexer import run_index_pipeline
+from multimodal_rag.pipeline.indexer import (
+    run_index_pipeline,
+    resume_index_pipeline,
+    IndexOptions,
+    DEFAULT_STATE_DIR,
+)
+from multimodal_rag.pipeline.estimate import estimate_index_pipeline, EstimateReport
+from multimodal_rag.pipeline.batch import run_batch_index, BatchManifest, DEFAULT_MAX_PARALLEL_JOBS
 from multimodal_rag.pipeline.rag import run_rag_pipeline, RAGRequest
 from multimodal_rag.config.schema import IndexingConfig, RAGConfig
 
@@ -15,11 +22,24 @@ app = typer.Typer(help="Multimodal RAG CLI")
 
 @app.command()
 def index(
-    source: str = typer.Argument(..., help="Input source: local folder, archive file, or GitHub repo URL"),
-    config_path: Path = typer.Argument(..., help="Path to the JSON or YAML config file"),
-    project_id: str = typer.Argument(..., help="Project ID to associate with the indexed documents")
+    source: str | None = typer.Argument(None, help="Input source: local folder, archive file, or GitHub repo URL"),
+    config_path: Path | None = typer.Argument(None, help="Path to the JSON or YAML config file"),
+    project_id: str | None = typer.Argument(None, help="Project ID to associate with the indexed documents"),
+    incremental: bool = typer.Option(False, "--incremental", help="Skip unchanged files, replace changed and delete removed ones"),
+    journal: bool = typer.Option(False, "--journal", help="Record job progress on disk so an interrupted run can be resumed"),
+    resume: str | None = typer.Option(None, "--resume", help="Resume a journaled job by its id"),
+    state_dir: Path = typer.Option(Path(DEFAULT_STATE_DIR), "--state-dir", help="Directory for local indexing state (manifests, jobs)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Load and chunk only, then report projected API calls, time and cost"),
 ):
     """Indexing pipeline: load, chunk, embed, index"""
+    if resume:
+        asyncio.run(resume_index_pipeline(resume, state_dir))
+        return
+
+    if source is None or config_path is None or project_id is None:
+        typer.echo("SOURCE, CONFIG_PATH and PROJECT_ID are required unless --resume is given", err=True)
+        raise typer.Exit(code=2)
+
     try:
         cfg_dict = yaml.safe_load(config_path.read_text())
         cfg = IndexingConfig.model_validate(cfg_dict)
@@ -28,7 +48,62 @@ def index(
         typer.echo(e, err=True)
         raise typer.Exit(code=1)
 
-    asyncio.run(run_index_pipeline(source, cfg, project_id))
+    options = IndexOptions(incremental=incremental, journal=journal, state_dir=state_dir)
+    if dry_run:
+        _print_estimate(asyncio.run(estimate_index_pipeline(source, cfg, project_id, options)))
+        return
+    asyncio.run(run_index_pipeline(source, cfg, project_id, options))
+
+
+def _print_estimate(report: EstimateReport) -> None:
+    typer.echo(f"Dry run for {report.source}")
+    typer.echo(f"{'format':<16}{'docs':>8}{'chunks':>10}{'chars':>14}{'tokens':>12}")
+    for name, stats in sorted(report.formats.items()):
+        tokens = "n/a" if stats.tokens is None else stats.tokens
+        typer.echo(f"{name:<16}{stats.documents:>8}{stats.chunks:>10}{stats.characters:>14}{tokens:>12}")
+    typer.echo(
+        f"Total: {report.documents} docs, {report.chunks} chunks, "
+        f"{report.images} images, {report.audio} audio files, {report.skipped} unchanged skipped, "
+        f"{report.filtered} filtered before reading, "
+        f"{report.duplicates} duplicates collapsed, {report.near_duplicates} near-duplicate chunks"
+    )
+    typer.echo(f"Load and chunk: {report.load_and_chunk_seconds}s")
+    for stage in report.stages:
+        typer.echo(f"{stage.stage} ({stage.provider}): {stage.calls} calls, ~{stage.seconds}s, ~${stage.cost}")
+    typer.echo(f"Projected: {report.api_calls} API calls, ~{report.seconds}s wall-clock, ~${report.cost}")
+
+
+@app.command("index-batch")
+def index_batch(
+    manifest_path: Path = typer.Argument(..., help="YAML/JSON file with a `jobs` list of {source, project_id} entries"),
+    config_path: Path = typer.Argument(..., help="Path to the JSON or YAML config file"),
+    max_parallel: int = typer.Option(DEFAULT_MAX_PARALLEL_JOBS, "--max-parallel", help="Number of sources indexed concurrently"),
+    incremental: bool = typer.Option(False, "--incremental", help="Skip unchanged files, replace changed and delete removed ones"),
+    state_dir: Path = typer.Option(Path(DEFAULT_STATE_DIR), "--state-dir", help="Directory for local indexing state (manifests)"),
+):
+    """Index many sources into their projects concurrently over shared clients"""
+    try:
+        cfg = IndexingConfig.model_validate(yaml.safe_load(config_path.read_text()))
+        manifest = BatchManifest.model_validate(yaml.safe_load(manifest_path.read_text()))
+    except ValidationError as e:
+        typer.echo("Validation failed:", err=True)
+        typer.echo(e, err=True)
+        raise typer.Exit(code=1)
+
+    options = IndexOptions(incremental=incremental, state_dir=state_dir)
+    report = asyncio.run(run_batch_index(manifest, cfg, options, max_parallel))
+
+    for job in report.jobs:
+        status = f"FAILED: {job.error}" if job.error else f"{job.documents} docs, {job.chunks} chunks, {job.duration}s"
+        typer.echo(f"{job.project_id} <- {job.source}: {status}")
+    summary = report.summary()
+    typer.echo(
+        f"Total: {summary['documents']} docs, {summary['chunks']} chunks in {summary['duration']}s "
+        f"({summary['documents_per_second']} docs/s, {summary['chunks_per_second']} chunks/s), "
+        f"{summary['failed']}/{summary['jobs']} jobs failed"
+    )
+    if report.failed:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -1,23 +1,24 @@
-import asyncio
-
 from multimodal_rag.asset_store.types import AssetStore
-from multimodal_rag.utils.loader import image_bytes_to_base64
+from multimodal_rag.utils.loader import encode_image_async
 from multimodal_rag.log_config import logger
 
+DEFAULT_IMAGE_SIZE = 768  # shorter side of images returned with search results, e.g. for a vision LLM
+
 
 class AssetReaderService:
-    def __init__(self, stores: dict[str, AssetStore]):
+    def __init__(self, stores: dict[str, AssetStore], image_size: int | None = DEFAULT_IMAGE_SIZE):
         self.stores = stores
+        self.image_size = image_size
 
     async def read(self, storage_type: str, uri: str) -> bytes:
         if storage_type not in self.stores:
             raise ValueError(f"No reader for storage_type: {storage_type}")
         return await self.stores[storage_type].read(uri)
 
-    async def read_image_base64(self, storage_type: str, uri: str, format: str = "PNG") -> str | None:
+    async def read_image_base64(self, storage_type: str, uri: str) -> str | None:
         try:
             image_bytes = await self.read(storage_type, uri)
-            return await asyncio.to_thread(image_bytes_to_base64, image_bytes, format)
+            return await encode_image_async(image_bytes, self.image_size)
         except Exception as e:
             logger.warning(f"Failed to encode image from {uri}: {e}")
             return None
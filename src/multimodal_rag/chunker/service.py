@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from typing import List
 import asyncio
 
@@ -30,6 +31,12 @@ class ChunkerService:
         await asyncio.gather(*(self._chunk_one(doc) for doc in docs))
         logger.info("Finished chunking documents")
 
+    async def chunk_document(self, doc: Document) -> None:
+        """
+        Split a single document into chunks.
+        """
+        await self._chunk_one(doc)
+
     async def _chunk_one(self, doc: Document) -> None:
         """
         Chunk one document.
@@ -74,7 +81,26 @@ class ChunkerService:
         if isinstance(buffer_tail, str) and buffer_tail.strip():
             text_chunks.append(buffer_tail.strip())
 
-        return [
+        chunks = [
             Chunk(chunk_id=i, content=c)
             for i, c in enumerate(text_chunks)
         ]
+        if doc.page_offsets:
+            self._assign_pages(doc.content, doc.page_offsets, chunks)
+        return chunks
+
+    def _assign_pages(self, content: str, page_offsets: List[int], chunks: List[Chunk]) -> None:
+        """
+        Locate each chunk in the content, searching forward from the previous chunk
+        (chunks may overlap), and record the pages it spans. Chunks the splitter
+        rewrote can't be located and get no pages.
+        """
+        cursor = 0
+        for chunk in chunks:
+            # Chunks start within a buffer of the previous one; bound the search accordingly
+            pos = content.find(chunk.content, cursor, cursor + len(chunk.content) + self.buffer_size)
+            if pos == -1:
+                continue
+            chunk.page_start = bisect_right(page_offsets, pos)
+            chunk.page_end = bisect_right(page_offsets, pos + len(chunk.content) - 1)
+            cursor = pos
@@ -107,7 +107,7 @@ def create_transcriber(config: TranscribingConfig) -> AudioTranscriber:
     cls = TRANSCRIBER_MAPPING.get(config.type)
     if not cls:
         raise ValueError(f"Unknown transcriber type: {config.type}")
-    return cls()(model=config.model)
+    return cls()(model=config.model, timeout=config.timeout)
 
 
 def create_captioner(config: CaptioningConfig) -> ImageCaptioner:
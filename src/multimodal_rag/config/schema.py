@@ -2,6 +2,16 @@ from pydantic import BaseModel
 from typing import Literal, Any
 
 
+class ConcurrencyConfig(BaseModel):
+    adaptive: bool = True  # false: fixed at `initial`
+    initial: int = 8
+    min: int = 1
+    max: int = 32
+    backoff_ratio: float = 0.5  # on timeouts, 429 and 5xx
+    latency_backoff_ratio: float = 0.9  # on latency above the tolerance
+    latency_tolerance: float = 2.0  # x the baseline latency
+
+
 class ChunkingConfig(BaseModel):
     token_chunker: dict[str, Any] | None = None
     sentence_chunker: dict[str, Any] | None = None
@@ -16,6 +26,7 @@ class TextEmbeddingConfig(BaseModel):
     type: Literal["replicate", "custom"]
     model: str
     normalize: bool | None = True
+    concurrency: ConcurrencyConfig = ConcurrencyConfig()  # embedding batches in flight
 
 
 class ImageEmbeddingConfig(BaseModel):
@@ -23,6 +34,7 @@ class ImageEmbeddingConfig(BaseModel):
     model: str
     input_size: int | None = 224
     normalize: bool | None = True
+    concurrency: ConcurrencyConfig = ConcurrencyConfig()
 
 
 class EmbeddingConfig(BaseModel):
@@ -62,25 +74,101 @@ class AssetStoreConfig(BaseModel):
     type: Literal["s3", "local"]
     s3: S3AssetConfig | None = None
     local: LocalAssetConfig | None = None
+    concurrency: ConcurrencyConfig = ConcurrencyConfig()
 
 
 class TranscribingConfig(BaseModel):
     type: Literal["replicate", "custom"]
     model: str
+    segment_seconds: float = 120.0  # longer audio is split into segments transcribed concurrently
+    overlap_seconds: float = 2.0  # shared by neighbouring segments, so words at the cuts survive
+    timeout: float = 300.0  # seconds per transcription request
+    concurrency: ConcurrencyConfig = ConcurrencyConfig(initial=4, max=8)  # segments in flight
 
 
 class CaptioningConfig(BaseModel):
     type: Literal["custom"]
     model: str
+    input_size: int | None = 384  # shorter image side sent to the captioner; None sends the original size
+    batch_size: int = 8  # images per captioning request, collected across files; at most the file concurrency
+    batch_wait_ms: float = 50.0  # how long the first queued image waits for a full batch
+    concurrency: ConcurrencyConfig = ConcurrencyConfig(initial=2, max=8)  # batches in flight
+
+
+class ArchiveConfig(BaseModel):
+    # Limits against archive bombs, checked on the bytes actually read
+    max_members: int = 100_000
+    max_member_size: int = 512 * 1024 ** 2
+    max_total_size: int = 16 * 1024 ** 3
+    max_ratio: float = 200.0  # uncompressed content / archive file size
+    decode_workers: int | None = None  # threads decompressing zip members, min(8, CPU cores) if unset
+
+
+class LoadingConfig(BaseModel):
+    parser_backend: Literal["thread", "process"] = "thread"  # PDF page ranges run in parallel only with process
+    parser_workers: int | None = None  # defaults to the number of CPU cores
+    max_concurrency: int | None = None  # files read concurrently; derived from the backend if unset
+    file_concurrency: ConcurrencyConfig | None = None  # adaptive file reading, overrides max_concurrency
+    github_concurrency: ConcurrencyConfig = ConcurrencyConfig()  # GitHub API requests in flight
+    github_mode: Literal["tarball", "contents"] = "tarball"  # one streamed tarball, or one request per file
+    include: list[str] = []  # gitignore-style patterns; if set, only matching files are loaded
+    exclude: list[str] = []  # gitignore-style patterns of files and directories to skip
+    gitignore: bool = True  # honour .gitignore files found in walked directories
+    ignored_dirs: list[str] | None = None  # directory names never descended into; VCS, dependency and cache dirs if unset
+    max_file_size: int | None = None  # larger files are skipped before reading or downloading them
+    extensions: list[str] | None = None  # allow-list of suffixes or exact file names, e.g. [".py", "Dockerfile"]
+    archive: ArchiveConfig = ArchiveConfig()
+
+
+class PipelineConfig(BaseModel):
+    mode: Literal["batch", "streaming"] = "batch"
+    queue_size: int = 64
+    workers: int = 4
+    import_batch_size: int = 100
+    image_cache_bytes: int = 256 * 1024 ** 2  # preprocessed image payloads shared by captioning and embedding
+
+
+class NearDedupConfig(BaseModel):
+    threshold: float = 0.8  # estimated Jaccard similarity of word shingles
+    num_perm: int = 128
+    bands: int = 16  # LSH bands, must divide num_perm
+    shingle_size: int = 5  # words per shingle
+    action: Literal["reuse", "drop"] = "reuse"  # reuse the representative's embedding, or drop the chunk
+    max_representatives: int = 100_000  # oldest are evicted beyond this, bounding memory in long runs
+
+
+class DedupConfig(BaseModel):
+    exact: bool = True  # collapse byte-identical files into one document
+    near: NearDedupConfig | None = None  # near-duplicate chunk detection, off if unset
+
+
+class ProviderRateConfig(BaseModel):
+    seconds_per_call: float = 1.0  # average latency of one request
+    concurrency: int = 8  # requests in flight at once
+    calls_per_minute: float | None = None  # provider rate limit, if any
+    cost_per_call: float = 0.0
+    cost_per_million_tokens: float = 0.0
+
+
+class EstimationConfig(BaseModel):
+    # Keyed by provider type (replicate, custom, ...); unknown providers use the defaults
+    providers: dict[str, ProviderRateConfig] = {}
+
+    def rate(self, provider: str) -> ProviderRateConfig:
+        return self.providers.get(provider) or ProviderRateConfig()
 
 
 class IndexingConfig(BaseModel):
+    loading: LoadingConfig = LoadingConfig()
     chunking: ChunkingConfig
     embedding: EmbeddingConfig
     transcribing: TranscribingConfig | None = None
     captioning: CaptioningConfig | None = None
     storaging: StoragingConfig
     asset_store: AssetStoreConfig | None = None
+    pipeline: PipelineConfig = PipelineConfig()
+    dedup: DedupConfig = DedupConfig()
+    estimation: EstimationConfig = EstimationConfig()
 
 
 # --- RAG (retrieve + generate) config ---
@@ -14,7 +14,7 @@ SUPPORTED_ALL = (
     | SUPPORTED_IMAGES
 )
 
-SUPPORTED_ARCHIVES = {".zip", ".tar.gz", ".tar"}
+SUPPORTED_ARCHIVES = {".zip", ".tar", ".tar.gz", ".tar.bz2", ".tar.xz", ".tar.zst"}
 KNOWN_BUT_UNSUPPORTED = {".rar", ".7z"}
 
 __all__ = [
@@ -0,0 +1,66 @@
+from multimodal_rag.document import Document, MetaConfig
+from multimodal_rag.log_config import logger
+from multimodal_rag.pipeline.incremental import IncrementalSync
+
+
+class ExactDeduplicator:
+    """
+    Collapses byte-identical files (same fingerprint) into one document.
+
+    The first document seen for a fingerprint is kept and processed; the paths of
+    later copies are recorded in its `metadata.aliases`. A copy that shows up after
+    its original was imported (streaming mode) is collected in `late_aliases`, whose
+    stored metadata the pipeline rewrites once the run is imported. In incremental
+    runs a copy of a document indexed by an earlier run is recorded in the manifest
+    under the stored document, without rewriting its metadata.
+    """
+
+    def __init__(self, sync: IncrementalSync | None = None):
+        # Only metadata is kept, so streaming runs don't hold on to processed documents
+        self.originals: dict[str, MetaConfig] = {}
+        self.sync = sync
+        # Copies of files skipped as unchanged are matched against the previous runs
+        self.indexed = sync.indexed_paths() if sync else {}
+        self.imported: dict[str, str] = {}  # fingerprint -> uuid of originals already stored
+        self.late_aliases: dict[str, MetaConfig] = {}  # uuid -> metadata to rewrite after the import
+        self.duplicates = 0
+
+    def select(self, doc: Document) -> bool:
+        """
+        Register a loaded document and return True if it is the first copy of its content.
+        """
+        fingerprint = doc.metadata.fingerprint
+        alias = doc.metadata.path or doc.metadata.filename
+        original = self.originals.get(fingerprint)
+        if original is None:
+            indexed = self.indexed.get(fingerprint)
+            if indexed is None or not self.sync.add_alias(doc, indexed):
+                self.originals[fingerprint] = doc.metadata
+                return True
+            self._collapsed(alias, indexed)
+            return False
+
+        original.aliases.append(alias)
+        if (uuid := self.imported.get(fingerprint)) is not None:
+            self.late_aliases[uuid] = original
+            if self.sync and original.path:
+                # Unless the original's manifest entry is still being written, which picks the alias up
+                self.sync.add_alias(doc, original.path)
+        self._collapsed(alias, original.path or original.filename)
+        return False
+
+    def mark_imported(self, docs: list[Document]) -> None:
+        """
+        Register documents about to be stored; copies found later are collected in `late_aliases`.
+        """
+        for doc in docs:
+            self.imported[doc.metadata.fingerprint] = doc.uuid
+
+    def filter(self, docs: list[Document]) -> list[Document]:
+        unique = [doc for doc in docs if self.select(doc)]
+        logger.info("Exact deduplication", extra={"unique": len(unique), "duplicates": self.duplicates})
+        return unique
+
+    def _collapsed(self, alias: str, original: str) -> None:
+        self.duplicates += 1
+        logger.debug("Duplicate file collapsed", extra={"alias": alias, "original": original})
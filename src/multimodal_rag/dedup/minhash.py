@@ -0,0 +1,179 @@
+import asyncio
+import math
+import random
+import re
+import zlib
+from array import array
+from collections import OrderedDict
+
+from multimodal_rag.config.schema import NearDedupConfig
+from multimodal_rag.document import Document, Chunk
+from multimodal_rag.log_config import logger
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"\w+")
+
+Signature = array  # unsigned 32-bit min-hashes, one per permutation
+
+
+class Representative:
+    """
+    What a linked near-duplicate needs from the chunk it duplicates: the signature
+    to compare against, and the embedding once the chunk is embedded. The chunk
+    itself is referenced only until then.
+    """
+
+    __slots__ = ("signature", "bands", "chunk", "_embedding")
+
+    def __init__(self, signature: Signature, bands: list[bytes], chunk: Chunk | None):
+        self.signature = signature
+        self.bands = bands
+        self.chunk = chunk
+        self._embedding: array | None = None
+
+    @property
+    def embedding(self) -> list[float] | None:
+        return None if self._embedding is None else self._embedding.tolist()
+
+    def capture(self) -> bool:
+        """Keep the chunk's embedding once it exists and release the chunk. Returns True when done."""
+        if self.chunk is not None and self.chunk.embedding is not None:
+            self._embedding = array("d", self.chunk.embedding)
+            self.chunk = None
+        return self.chunk is None
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-identical text chunks (license headers, boilerplate, repeated paragraphs)
+    with MinHash signatures over word shingles and LSH banding.
+
+    A chunk whose estimated Jaccard similarity to an earlier chunk reaches the threshold
+    is either linked to it (`duplicate_of`, the embedder then skips it and `resolve`
+    copies the representative's embedding) or dropped from its group.
+    Representatives keep the signature and, with `reuse`, the embedding vector (about
+    (num_perm x 4 + dim x 8) bytes each). The oldest are evicted beyond
+    `max_representatives`; later copies of an evicted chunk are embedded again.
+    """
+
+    def __init__(self, config: NearDedupConfig, batch_size: int, seed: int = 1):
+        if config.num_perm % config.bands:
+            raise ValueError(f"num_perm ({config.num_perm}) must be divisible by bands ({config.bands})")
+        self.config = config
+        self.batch_size = batch_size
+        self.rows = config.num_perm // config.bands
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(config.num_perm)]
+        self.buckets: list[dict[bytes, Representative]] = [{} for _ in range(config.bands)]
+        self.representatives: OrderedDict[int, Representative] = OrderedDict()  # by id, oldest first
+        self.unregistered: dict[str, list[tuple[Chunk, Signature]]] = {}
+        self.pending: list[Representative] = []  # still referencing a chunk that awaits its embedding
+        self.duplicates = 0
+        self.saved_calls = 0
+
+    async def mark(self, doc: Document, register: bool = True) -> None:
+        """
+        Link or drop the near-duplicate chunks of a chunked document.
+        With `register=False` its remaining chunks become representatives only once
+        `register` is called, e.g. after they were embedded.
+        """
+        for group in doc.chunk_groups:
+            if group.modality != "text" or not group.chunks:
+                continue
+
+            signatures = await asyncio.to_thread(self._signatures, [chunk.content for chunk in group.chunks])
+            kept = []
+            for chunk, signature in zip(group.chunks, signatures):
+                representative = self._find(signature)
+                if representative is not None:
+                    self.duplicates += 1
+                    if self.config.action == "reuse":
+                        chunk.duplicate_of = representative
+                        kept.append(chunk)
+                    continue
+
+                kept.append(chunk)
+                if register:
+                    self._insert(chunk, signature)
+                else:
+                    self.unregistered.setdefault(doc.uuid, []).append((chunk, signature))
+
+            embedded = [chunk for chunk in kept if chunk.duplicate_of is None]
+            self.saved_calls += (
+                math.ceil(len(group.chunks) / self.batch_size) - math.ceil(len(embedded) / self.batch_size)
+            )
+            if self.config.action == "drop":
+                group.chunks = kept
+
+    def register(self, doc: Document) -> None:
+        for chunk, signature in self.unregistered.pop(doc.uuid, []):
+            self._insert(chunk, signature)
+
+    def resolve(self, doc: Document) -> bool:
+        """
+        Copy representative embeddings into linked chunks.
+        Returns False while some representative is not embedded yet.
+        """
+        self.pending = [representative for representative in self.pending if not representative.capture()]
+        resolved = True
+        for group in doc.chunk_groups:
+            for chunk in group.chunks:
+                if chunk.duplicate_of is None:
+                    continue
+                if chunk.duplicate_of.embedding is None:
+                    resolved = False
+                else:
+                    chunk.embedding = chunk.duplicate_of.embedding
+        return resolved
+
+    def stats(self) -> dict:
+        return {"near_duplicates": self.duplicates, "saved_embedding_calls": self.saved_calls}
+
+    def _find(self, signature: Signature) -> Representative | None:
+        for band, bucket in zip(self._bands(signature), self.buckets):
+            if (representative := bucket.get(band)) is None:
+                continue
+            if self._similarity(signature, representative.signature) >= self.config.threshold:
+                logger.debug("Near-duplicate chunk", extra={"representatives": len(self.representatives)})
+                return representative
+        return None
+
+    def _insert(self, chunk: Chunk, signature: Signature) -> None:
+        # Dropped duplicates never need the representative's embedding
+        representative = Representative(
+            signature, self._bands(signature), chunk if self.config.action == "reuse" else None
+        )
+        for band, bucket in zip(representative.bands, self.buckets):
+            bucket.setdefault(band, representative)
+        self.representatives[id(representative)] = representative
+        if not representative.capture():
+            self.pending.append(representative)
+
+        if len(self.representatives) > self.config.max_representatives:
+            _, evicted = self.representatives.popitem(last=False)
+            for band, bucket in zip(evicted.bands, self.buckets):
+                if bucket.get(band) is evicted:
+                    del bucket[band]
+
+    def _bands(self, signature: Signature) -> list[bytes]:
+        # Compact dict keys: each band's hashes as raw bytes
+        raw = signature.tobytes()
+        step = self.rows * signature.itemsize
+        return [raw[i: i + step] for i in range(0, len(raw), step)]
+
+    def _similarity(self, a: Signature, b: Signature) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def _signatures(self, texts: list[str]) -> list[Signature]:
+        return [self._signature(text) for text in texts]
+
+    def _signature(self, text: str) -> Signature:
+        words = _WORD_RE.findall(text.lower())
+        size = self.config.shingle_size
+        shingles = {" ".join(words[i: i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        return array("I", (
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.perms
+        ))
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
@@ -5,6 +7,9 @@ class Chunk(BaseModel):
     chunk_id: int
     content: str
     embedding: list[float] | None = Field(default=None)
+    duplicate_of: Any = Field(default=None, exclude=True, repr=False)  # near-duplicate Representative
+    page_start: int | None = None  # 1-based pages spanned by the chunk, for paged formats like PDF
+    page_end: int | None = None
 
 
 class ScoredChunk(BaseModel):
@@ -41,6 +46,8 @@ class MetaConfig(BaseModel):
     last_modified: int
     fingerprint: str
     mime: str
+    path: str | None = None  # relative to the root of the indexed source
+    aliases: list[str] = Field(default_factory=list)  # paths of byte-identical copies
 
 
 class ScoredItem(BaseModel):
@@ -53,6 +60,8 @@ class ScoredItem(BaseModel):
     asset_uri: str | None = None
     caption: str | None = None
     image_base64: str | None = None
+    page_start: int | None = None
+    page_end: int | None = None
     metadata: MetaConfig
 
 
@@ -64,6 +73,7 @@ class Document(BaseModel):
     source: SourceConfig
     metadata: MetaConfig
     chunk_groups: list[ChunkGroup] = Field(default_factory=list)
+    page_offsets: list[int] | None = Field(default=None, exclude=True, repr=False)  # content offset of each page
 
     def to_json(self) -> dict:
         return {
@@ -5,6 +5,7 @@ import asyncio
 from multimodal_rag.config.schema import ImageEmbeddingConfig
 from multimodal_rag.embedder.types import ImageEmbedder
 from multimodal_rag.utils.vector import l2_normalize
+from multimodal_rag.utils.loader import image_data_uri
 from multimodal_rag.utils.retry import backoff
 from aiohttp import ClientError
 from asyncio import TimeoutError
@@ -36,11 +37,8 @@ class CustomImageEmbedder(ImageEmbedder):
     async def _embed_one(self, session: aiohttp.ClientSession, img_b64: str) -> list[float]:
         url = f"{self.base_url}/embed"
 
-        if not img_b64.startswith("data:image/"):
-            img_b64 = f"data:image/png;base64,{img_b64}"
-
         data = {
-            "image_base64": img_b64,
+            "image_base64": image_data_uri(img_b64),
             "model_name": self._config.model
         }
 
@@ -4,6 +4,7 @@ import asyncio
 from multimodal_rag.config.schema import ImageEmbeddingConfig
 from multimodal_rag.embedder.replmixin import ReplicateClientMixin
 from multimodal_rag.embedder.types import ImageEmbedder
+from multimodal_rag.utils.loader import image_data_uri
 from multimodal_rag.utils.retry import backoff
 from multimodal_rag.utils.vector import l2_normalize
 from aiohttp import ClientError
@@ -41,13 +42,10 @@ class ReplicateImageEmbedder(ReplicateClientMixin, ImageEmbedder):
             "Content-Type": "application/json"
         }
 
-        if not img_b64.startswith("data:image/"):
-            img_b64 = f"data:image/png;base64,{img_b64}"
-
         payload = {
             "version": self._config.model,
             "input": {
-                "image": img_b64
+                "image": image_data_uri(img_b64)
             }
         }
 
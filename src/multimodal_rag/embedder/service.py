@@ -3,6 +3,8 @@ import asyncio
 from multimodal_rag.document import Document, Chunk, ChunkGroup
 from multimodal_rag.embedder.types import TextEmbedder, ImageEmbedder
 from multimodal_rag.log_config import logger
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
+from multimodal_rag.utils.image_cache import ImagePayloadCache
 from multimodal_rag.utils.loader import load_image_base64
 
 DEFAULT_MAX_CONCURRENCY = 8
@@ -16,11 +18,18 @@ class EmbedderService:
         text_embedder: TextEmbedder,
         image_embedder: ImageEmbedder | None = None,
         batch_size: int = DEFAULT_BATCH_SIZE,
+        text_limiter: AdaptiveLimiter | None = None,
+        image_limiter: AdaptiveLimiter | None = None,
+        image_size: int | None = None,
+        image_cache: ImagePayloadCache | None = None,
     ):
         self.text_embedder = text_embedder
         self.image_embedder = image_embedder
-        self.semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+        self.text_limiter = text_limiter or AdaptiveLimiter.fixed("text_embedder", DEFAULT_MAX_CONCURRENCY)
+        self.image_limiter = image_limiter or AdaptiveLimiter.fixed("image_embedder", DEFAULT_MAX_CONCURRENCY)
         self.batch_size = batch_size
+        self.image_size = image_size  # shorter side images are downscaled to before embedding
+        self.image_cache = image_cache  # payloads shared with captioning
 
     @property
     def text_model_name(self) -> str:
@@ -35,6 +44,9 @@ class EmbedderService:
         await asyncio.gather(*(self._embed_one_document(doc) for doc in docs))
         logger.info("Finished embedding documents")
 
+    async def embed_document(self, doc: Document) -> None:
+        await self._embed_one_document(doc)
+
     async def embed_text_query(self, query: str) -> list[float]:
         logger.debug("Embedding text query", extra={"query_length": len(query)})
         embeddings = await self.text_embedder.embed_texts([query])
@@ -77,8 +89,12 @@ class EmbedderService:
 
         logger.debug("Embedding image document", extra={"path": path})
 
-        image_base64 = await load_image_base64(path)
-        embedding = (await self.image_embedder.embed_images([image_base64]))[0]
+        if self.image_cache:
+            image_base64 = await self.image_cache.get(doc.metadata.fingerprint, path)
+        else:
+            image_base64 = await load_image_base64(path, self.image_size)
+        async with self.image_limiter.acquire():
+            embedding = (await self.image_embedder.embed_images([image_base64]))[0]
         caption = doc.content or ""
 
         for group in doc.chunk_groups:
@@ -103,20 +119,23 @@ class EmbedderService:
         text_groups = [g for g in doc.chunk_groups if g.modality == "text"]
 
         for group in text_groups:
-            chunks = group.chunks
+            # Near-duplicates get their representative's embedding instead
+            chunks = [chunk for chunk in group.chunks if chunk.duplicate_of is None]
             contents = [chunk.content for chunk in chunks]
-            if not contents:
+            if not group.chunks:
                 logger.warning("No text content to embed", extra={"doc_id": doc.uuid})
                 continue
 
+            group.embedder_name = self.text_model_name
+            if not contents:
+                continue
+
             embeddings = await self._batch_embed_texts(contents)
 
             if len(embeddings) != len(chunks):
                 logger.error("Embedding count mismatch", extra={"doc_id": doc.uuid})
                 raise RuntimeError("Mismatch in embedding and chunk count")
 
-            group.embedder_name = self.text_model_name
-
             for chunk, emb in zip(chunks, embeddings):
                 chunk.embedding = emb
 
@@ -129,7 +148,7 @@ class EmbedderService:
         logger.debug("Batching text chunks", extra={"total_chunks": len(contents), "batches": len(batches)})
 
         async def embed_with_limit(batch):
-            async with self.semaphore:
+            async with self.text_limiter.acquire():
                 return await self.text_embedder.embed_texts(batch)
 
         tasks = [asyncio.create_task(embed_with_limit(batch)) for batch in batches]
@@ -1,5 +1,6 @@
 from multimodal_rag.generator.types import GenerateRequest
 from multimodal_rag.generator.prompt_builder.types import PromptBuilder
+from multimodal_rag.utils.loader import image_data_uri
 
 
 class OpenAIPromptBuilder(PromptBuilder):
@@ -16,7 +17,7 @@ class OpenAIPromptBuilder(PromptBuilder):
                     content.append({"type": "text", "text": doc.caption})
                 content.append({
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{doc.image_base64}"}
+                    "image_url": {"url": image_data_uri(doc.image_base64)}
                 })
                 messages.append({"role": "user", "content": content})
             elif doc.modality == "text":
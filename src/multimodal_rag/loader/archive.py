@@ -1,47 +1,316 @@
 import asyncio
-from pathlib import Path
+import os
+import tarfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, BinaryIO, Callable, Iterator, NamedTuple
 
+from multimodal_rag.config.schema import ArchiveConfig
 from multimodal_rag.constants import KNOWN_BUT_UNSUPPORTED
+from multimodal_rag.document import Document
 from multimodal_rag.log_config import logger
 from multimodal_rag.loader.reader.registry import ReaderRegistry
+from multimodal_rag.loader.skips import record_skip
 from multimodal_rag.loader.types import DocumentLoader, LoadResult
+from multimodal_rag.loader.utils import is_archive
+from multimodal_rag.loader.walker import DirectoryWalker, MATCH_ALL
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
 from multimodal_rag.utils.temp_dirs import make_tmp_dir
 
+DEFAULT_MAX_CONCURRENCY = 8
+_RATIO_GRACE_BYTES = 16 * 1024 ** 2  # small archives may compress arbitrarily well
+_TAR_MODES = {
+    (".tar", ".gz"): "r|gz",
+    (".tar", ".bz2"): "r|bz2",
+    (".tar", ".xz"): "r|xz",
+}
+
+
+class ArchiveMember(NamedTuple):
+    name: str  # normalized posix path inside the archive
+    data: bytes
+    mtime: int
+
 
 class ArchiveLoader(DocumentLoader):
     """
-    Extracts the archive into a temp folder and returns for further processing.
+    Streams archive members straight into the readers without extracting the archive.
+
+    Members are read in a worker thread (zip members are decompressed in parallel),
+    and at most max_concurrency of them are handed to the readers at a time. Nested archives are spilled to a temp folder,
+    which is returned for further processing.
+    Members rejected by the walk rules are skipped before their content is read;
+    .gitignore files inside the archive are not consulted.
     """
 
     def __init__(
         self,
         registry: ReaderRegistry,
         show_progress: bool = False,
+        config: ArchiveConfig | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        walker: DirectoryWalker | None = None,
     ):
         self.registry = registry
+        self.walker = walker or DirectoryWalker()
         self.show_progress = show_progress
+        self.config = config or ArchiveConfig()
+        self.limiter = limiter or AdaptiveLimiter.fixed("files", DEFAULT_MAX_CONCURRENCY)
+        self.max_concurrency = self.limiter.max_limit
+
+    async def load(self, source: str, filter: str | None = None) -> LoadResult:
+        documents, next_sources = [], []
+        async for result in self.stream(source, filter):
+            documents.extend(result.documents)
+            next_sources.extend(result.next_sources)
+        return LoadResult(documents=documents, next_sources=next_sources)
+
+    async def stream(self, source: str, filter: str | None = None) -> AsyncIterator[LoadResult]:
+        logger.info("Streaming archive", extra={"path": source})
+
+        def select(name: str, size: int) -> bool:
+            if reason := self.walker.skip_reason(name, filter or MATCH_ALL, size):
+                record_skip(reason)
+                return False
+            return True
+
+        async for result in self.stream_members(iter_members(Path(source), self.config, select)):
+            yield result
+
+    async def stream_members(
+        self, members: Iterator[ArchiveMember] | AsyncIterator[ArchiveMember]
+    ) -> AsyncIterator[LoadResult]:
+        """
+        Feed members of any origin into the readers. A blocking iterator is advanced
+        in a worker thread. The iterator is closed when the stream ends.
+        """
+        is_async = hasattr(members, "__anext__")
+        nested_dir: Path | None = None
+        pending: set[asyncio.Task] = set()
+        try:
+            while True:
+                while len(pending) < self.max_concurrency:
+                    if is_async:
+                        member = await anext(members, None)
+                    else:
+                        member = await asyncio.to_thread(next, members, None)
+                    if member is None:
+                        break
+                    if is_archive(PurePosixPath(member.name)):
+                        nested_dir = nested_dir or make_tmp_dir(prefix="nested_")
+                        await asyncio.to_thread(_spill_member, nested_dir, member)
+                    else:
+                        pending.add(asyncio.create_task(self._process(member)))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield LoadResult(documents=task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            try:
+                if is_async:
+                    await members.aclose()
+                else:
+                    # Closing a zip iterator waits for its in-flight decodes
+                    await asyncio.to_thread(members.close)
+            except ValueError:
+                pass  # still running in a cancelled worker thread
+
+        if nested_dir:
+            yield LoadResult(documents=[], next_sources=[str(nested_dir)])
+
+    async def _process(self, member: ArchiveMember) -> list[Document]:
+        async with self.limiter.acquire():
+            path = Path(member.name)
+            try:
+                reader = self.registry(path)
+                logger.debug("Loading archive member", extra={"member": member.name})
+                docs = await reader.load_bytes(member.data, path)
+                for doc in docs:
+                    doc.metadata.path = member.name
+                    doc.metadata.last_modified = member.mtime
+                return docs
+            except Exception as e:
+                logger.exception("Failed to load archive member", extra={"member": member.name, "error": str(e)})
+                raise
+
+
+def iter_members(
+    path: Path, config: ArchiveConfig, select: Callable[[str, int], bool] | None = None
+) -> Iterator[ArchiveMember]:
+    """
+    Yield the regular file members of a zip or tar archive, in archive order.
+    Tar members are read one at a time; zip members are decompressed in parallel threads.
+    Members rejected by `select(name, size)` are skipped without reading their content.
+    Raises ValueError when the archive exceeds the configured limits.
+    """
+    archive_size = path.stat().st_size
+    guard = _MemberGuard(config, lambda: archive_size)
+    suffixes = tuple(s.lower() for s in path.suffixes)
+
+    if suffixes[-1:] == (".zip",):
+        yield from _zip_members(path, guard, config.decode_workers or min(8, os.cpu_count() or 1), select)
+    elif suffixes[-2:] in _TAR_MODES:
+        yield from _tar_members(path, _TAR_MODES[suffixes[-2:]], guard, select=select)
+    elif suffixes[-1:] == (".tar",):
+        yield from _tar_members(path, "r|", guard, select=select)
+    elif suffixes[-2:] == (".tar", ".zst"):
+        with _zstd_reader(path) as fileobj:
+            yield from _tar_members(path, "r|", guard, fileobj, select)
+    elif "".join(suffixes) in KNOWN_BUT_UNSUPPORTED:
+        raise NotImplementedError(f"Archive type {suffixes} is known but not supported yet")
+    else:
+        raise ValueError(f"Unsupported archive format: {str(path)}")
+
+
+def iter_tar_stream(
+    fileobj: BinaryIO,
+    config: ArchiveConfig,
+    mode: str,
+    compressed_size: Callable[[], int],
+    select: Callable[[str, int], bool] | None = None,
+) -> Iterator[ArchiveMember]:
+    """
+    Yield the regular file members of a tar stream that cannot seek, e.g. an HTTP response.
+    `compressed_size` returns the bytes consumed so far, for the compression ratio limit.
+    Members rejected by `select(name, size)` are skipped without reading their content.
+    """
+    yield from _tar_members(None, mode, _MemberGuard(config, compressed_size), fileobj, select)
+
+
+def _zip_members(
+    path: Path,
+    guard: "_MemberGuard",
+    workers: int,
+    select: Callable[[str, int], bool] | None = None,
+) -> Iterator[ArchiveMember]:
+    # Zip members are compressed independently and zlib releases the GIL,
+    # so members are decompressed in parallel, each thread with its own handle
+    local = threading.local()
+    handles: list[zipfile.ZipFile] = []
+
+    def decode(info: zipfile.ZipInfo, name: str) -> bytes:
+        if not hasattr(local, "zf"):
+            local.zf = zipfile.ZipFile(path, "r")
+            handles.append(local.zf)
+        with local.zf.open(info) as f:
+            return guard.read_capped(f, name)
+
+    with zipfile.ZipFile(path, "r") as zf, ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            # A window of 2 x workers keeps threads busy while bounding memory
+            window: deque = deque()
+            for info in zf.infolist():
+                if info.is_dir() or not (name := _normalize_name(info.filename)):
+                    continue
+                if select and not select(name, info.file_size):
+                    continue
+                guard.check_member(name, info.file_size)
+                window.append((info, name, pool.submit(decode, info, name)))
+                if len(window) >= 2 * workers:
+                    yield _zip_member(guard, *window.popleft())
+            while window:
+                yield _zip_member(guard, *window.popleft())
+        finally:
+            for _, _, future in window:
+                future.cancel()
+            pool.shutdown(wait=True)
+            for handle in handles:
+                handle.close()
+
+
+def _zip_member(guard: "_MemberGuard", info: zipfile.ZipInfo, name: str, future) -> ArchiveMember:
+    data = future.result()
+    guard.account(len(data))
+    return ArchiveMember(name=name, data=data, mtime=int(datetime(*info.date_time).timestamp()))
+
+
+def _tar_members(
+    path: Path | None,
+    mode: str,
+    guard: "_MemberGuard",
+    fileobj: BinaryIO | None = None,
+    select: Callable[[str, int], bool] | None = None,
+) -> Iterator[ArchiveMember]:
+    # Stream mode reads the archive sequentially, without seeking back for each member
+    with tarfile.open(None if fileobj else path, mode, fileobj=fileobj) as tf:
+        for info in tf:
+            if not info.isfile() or not (name := _normalize_name(info.name)):
+                continue
+            if select and not select(name, info.size):
+                continue
+            guard.check_member(name, info.size)
+            f = tf.extractfile(info)
+            if f is None:
+                continue
+            with f:
+                data = guard.read_capped(f, name)
+            guard.account(len(data))
+            yield ArchiveMember(name=name, data=data, mtime=int(info.mtime))
+
+
+@contextmanager
+def _zstd_reader(path: Path) -> Iterator[BinaryIO]:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is required to read .tar.zst archives.")
+
+    with open(path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+        yield reader
+
+
+class _MemberGuard:
+    """
+    Enforces member count, member size, total size and compression ratio limits
+    on the bytes actually read, so lying headers don't help an archive bomb.
+    """
+
+    def __init__(self, config: ArchiveConfig, compressed_size: Callable[[], int]):
+        self.config = config
+        self.compressed_size = compressed_size
+        self.members = 0
+        self.total = 0
+
+    def check_member(self, name: str, declared_size: int) -> None:
+        self.members += 1
+        if self.members > self.config.max_members:
+            raise ValueError(f"Archive has more than {self.config.max_members} members")
+        if declared_size > self.config.max_member_size:
+            raise ValueError(f"Archive member {name} exceeds {self.config.max_member_size} bytes")
+
+    def read_capped(self, f: BinaryIO, name: str) -> bytes:
+        data = f.read(self.config.max_member_size + 1)
+        if len(data) > self.config.max_member_size:
+            raise ValueError(f"Archive member {name} exceeds {self.config.max_member_size} bytes")
+        return data
+
+    def account(self, size: int) -> None:
+        self.total += size
+        if self.total > self.config.max_total_size:
+            raise ValueError(f"Archive content exceeds {self.config.max_total_size} bytes")
+        if self.total > _RATIO_GRACE_BYTES and self.total / max(self.compressed_size(), 1) > self.config.max_ratio:
+            raise ValueError(f"Archive compression ratio exceeds {self.config.max_ratio}")
+
+
+def _normalize_name(name: str) -> str | None:
+    parts = [part for part in PurePosixPath(name.replace("\\", "/")).parts if part not in ("/", ".")]
+    if not parts or ".." in parts:
+        if parts:
+            logger.warning("Skipping archive member outside the archive root", extra={"member": name})
+        return None
+    return "/".join(parts)
+
 
-    async def load(self, source: str, _: str | None = None) -> LoadResult:
-        tmp_path = make_tmp_dir()
-        tmp_path_str = str(tmp_path)
-        logger.info("Extracting archive", extra={"path": source, "destination": tmp_path_str})
-        await asyncio.to_thread(self._extract, Path(source), tmp_path)
-
-        return LoadResult(documents=[], next_sources=[tmp_path_str])
-
-    def _extract(self, arc_path: Path, target_path: Path) -> None:
-        suffix = arc_path.suffix.lower()
-        suffixes = tuple(s.lower() for s in arc_path.suffixes)
-
-        if suffix == ".zip":
-            import zipfile
-            with zipfile.ZipFile(arc_path, "r") as zf:
-                zf.extractall(target_path)
-        elif suffixes[-2:] == (".tar", ".gz"):
-            import tarfile
-            with tarfile.open(arc_path, "r:gz") as tf:
-                tf.extractall(target_path)
-        elif suffixes in KNOWN_BUT_UNSUPPORTED:
-            raise NotImplementedError(f"Archive type {suffixes} is known but not supported yet")
-        else:
-            raise ValueError(f"Unsupported archive format: {str(arc_path)}")
+def _spill_member(root: Path, member: ArchiveMember) -> None:
+    target = root / member.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(member.data)
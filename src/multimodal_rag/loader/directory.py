@@ -1,11 +1,15 @@
 import asyncio
+import itertools
 from pathlib import Path
+from typing import AsyncIterator
 
 from multimodal_rag.document import Document
 from multimodal_rag.loader.reader.registry import ReaderRegistry
 from multimodal_rag.log_config import logger
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
 from multimodal_rag.loader.types import DocumentLoader, LoadResult
 from multimodal_rag.loader.utils import is_archive
+from multimodal_rag.loader.walker import DirectoryWalker, MATCH_ALL
 
 try:
     from tqdm.asyncio import tqdm_asyncio as tqdm
@@ -13,44 +17,44 @@ except ImportError:
     from tqdm import tqdm
 
 DEFAULT_MAX_CONCURRENCY = 8
+WALK_BATCH_SIZE = 256  # paths pulled from the walker per worker thread hop
 
 
 class DirectoryLoader(DocumentLoader):
     """
     Loads documents from a directory using registry-based content readers.
+    Files are fed to readers while the directory tree is still being walked.
     """
 
     def __init__(
         self,
         registry: ReaderRegistry,
         show_progress: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limiter: AdaptiveLimiter | None = None,
+        walker: DirectoryWalker | None = None,
     ):
         self.registry = registry
+        self.walker = walker or DirectoryWalker()
         self.show_progress = show_progress
-        self.semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
-
-    async def load(self, source: str, filter: str = "**/*") -> LoadResult:
-        spath = Path(source)
-        if not spath.exists():
-            raise FileNotFoundError(f"Path does not exist: {source}")
-        if not spath.is_dir():
-            raise ValueError(f"Path is not a directory: {source}")
-
-        files = [f for f in spath.glob(filter) if f.is_file()]
-        next_sources = [str(f) for f in files if is_archive(f)]
-        to_process = [f for f in files if not is_archive(f)]
-
-        async def process(path: Path) -> list[Document]:
-            async with self.semaphore:
-                try:
-                    loader = self.registry(path)
-                    logger.debug("Loading file", extra={"path": str(path)})
-                    return await loader.load(path)
-                except Exception as e:
-                    logger.exception("Failed to load file", extra={"path": str(path), "error": str(e)})
-                    raise e
-
-        tasks = [process(p) for p in to_process]
+        self.limiter = limiter or AdaptiveLimiter.fixed("files", max_concurrency)
+        self.max_concurrency = self.limiter.max_limit
+
+    async def load(self, source: str, filter: str = MATCH_ALL) -> LoadResult:
+        root = Path(source)
+        next_sources = []
+        tasks = []
+        try:
+            async for path in self._walk(root, filter):
+                if is_archive(path):
+                    next_sources.append(str(path))
+                else:
+                    tasks.append(asyncio.create_task(self._process(path, root)))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
         iterator = asyncio.as_completed(tasks)
 
         if self.show_progress:
@@ -62,3 +66,53 @@ class DirectoryLoader(DocumentLoader):
             all_documents.extend(docs)
 
         return LoadResult(documents=all_documents, next_sources=next_sources)
+
+    async def stream(self, source: str, filter: str = MATCH_ALL) -> AsyncIterator[LoadResult]:
+        """
+        Yields documents file by file. At most max_concurrency files (the limiter's
+        upper bound) are read ahead of the consumer, so a slow consumer pauses the reading.
+        """
+        root = Path(source)
+        next_sources = []
+        paths = aiter(self._walk(root, filter))
+        pending: set[asyncio.Task] = set()
+        try:
+            while True:
+                while len(pending) < self.max_concurrency and (path := await anext(paths, None)) is not None:
+                    if is_archive(path):
+                        next_sources.append(str(path))
+                    else:
+                        pending.add(asyncio.create_task(self._process(path, root)))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield LoadResult(documents=task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if next_sources:
+            yield LoadResult(documents=[], next_sources=next_sources)
+
+    async def _process(self, path: Path, root: Path) -> list[Document]:
+        async with self.limiter.acquire():
+            try:
+                loader = self.registry(path)
+                logger.debug("Loading file", extra={"path": str(path)})
+                docs = await loader.load(path)
+                rel_path = path.relative_to(root).as_posix()
+                for doc in docs:
+                    doc.metadata.path = rel_path
+                return docs
+            except Exception as e:
+                logger.exception("Failed to load file", extra={"path": str(path), "error": str(e)})
+                raise e
+
+    async def _walk(self, root: Path, filter: str) -> AsyncIterator[Path]:
+        # The walk does blocking directory I/O, so it advances in a worker thread
+        paths = self.walker.walk(root, filter)
+        while batch := await asyncio.to_thread(list, itertools.islice(paths, WALK_BATCH_SIZE)):
+            for path in batch:
+                yield path
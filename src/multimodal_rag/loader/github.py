@@ -1,16 +1,25 @@
 import aiohttp
 import asyncio
+import io
 import os
+from collections import Counter
 from pathlib import Path
 from base64 import b64decode
+from typing import AsyncIterator, Iterator, Literal
 from aiohttp import ClientError
 from asyncio import TimeoutError
 
-from multimodal_rag.loader.utils import parse_github_url
+from multimodal_rag.loader.archive import ArchiveLoader, ArchiveMember, iter_tar_stream
+from multimodal_rag.loader.rate_limit import RateLimitScheduler
+from multimodal_rag.loader.utils import GitRepoInfo, parse_github_url
 from multimodal_rag.loader.reader.registry import ReaderRegistry
+from multimodal_rag.loader.revisions import RevisionScope, get_revision_scope
+from multimodal_rag.loader.skips import record_skip
 from multimodal_rag.loader.types import DocumentLoader, LoadResult
+from multimodal_rag.loader.walker import DirectoryWalker, MATCH_ALL
 from multimodal_rag.utils.retry import backoff
 from multimodal_rag.log_config import logger
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
 from multimodal_rag.utils.temp_dirs import make_tmp_dir
 
 try:
@@ -19,75 +28,389 @@ except ImportError:
     from tqdm import tqdm
 
 DEFAULT_MAX_CONNECTIONS = 8
+TARBALL_CHUNK_SIZE = 64 * 1024
+COMPARE_FILES_LIMIT = 300  # the compare API lists at most this many files
+INCREMENTAL_TARBALL_THRESHOLD = 500  # above this many changed files one tarball is cheaper
+MAX_RATE_LIMIT_PAUSES = 5  # rate-limited repeats of one request before it fails like an error status
+MAX_RATE_LIMIT_WAIT = 2 * 3600  # seconds of rate-limit pauses per request, two primary limit windows
 
 
 class GitHubRepoLoader(DocumentLoader):
     """
     GitHub loader using GitHub API.
-    Extracts all files into a temp folder and returns for further processing.
+
+    In `tarball` mode a repository is downloaded in one streamed request and its
+    members are fed straight into the readers. In `contents` mode, and for single
+    file (blob) URLs, files are fetched one by one into a temp folder, which is
+    returned for further processing.
     """
 
-    API_URL = "https://api.github.com"
+    API_URL = "https://api.github.com"  # overridden by the GITHUB_API_URL env variable
 
     def __init__(
         self,
         registry: ReaderRegistry,
         show_progress: bool = False,
+        limiter: AdaptiveLimiter | None = None,
+        mode: Literal["tarball", "contents"] = "tarball",
+        archive: ArchiveLoader | None = None,
+        walker: DirectoryWalker | None = None,
+        scheduler: RateLimitScheduler | None = None,
     ):
         self.registry = registry
         self.token = os.getenv("GITHUB_TOKEN")
+        self.api_url = os.getenv("GITHUB_API_URL", self.API_URL).rstrip("/")
         self.show_progress = show_progress
+        self.limiter = limiter or AdaptiveLimiter.fixed("github", DEFAULT_MAX_CONNECTIONS)
+        self.mode = mode
+        self.archive = archive or ArchiveLoader(registry)
+        self.walker = walker or DirectoryWalker()
+        # Shared by all runs, since they spend the same token's budget
+        self.scheduler = scheduler or RateLimitScheduler("github")
 
-    async def load(self, source: str, _: str | None = None) -> LoadResult:
+    async def load(self, source: str, filter: str | None = None) -> LoadResult:
         info = parse_github_url(source)
-        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-        connector = aiohttp.TCPConnector(limit=DEFAULT_MAX_CONNECTIONS)
-        tmp_path = make_tmp_dir()
+        if info.is_directory and (self.mode == "tarball" or get_revision_scope()):
+            documents, next_sources = [], []
+            async for result in self.stream(source, filter):
+                documents.extend(result.documents)
+                next_sources.extend(result.next_sources)
+            return LoadResult(documents=documents, next_sources=next_sources)
 
-        async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        tmp_path = make_tmp_dir()
+        async with self._session() as session:
             if not info.is_directory:
                 await self._fetch_and_store_file(session, info.path, info, tmp_path)
             else:
-                await self._fetch_repository_tree(info, tmp_path, session)
+                await self._fetch_repository_tree(info, tmp_path, session, filter or MATCH_ALL)
 
         return LoadResult(documents=[], next_sources=[str(tmp_path)])
 
+    async def stream(self, source: str, filter: str | None = None) -> AsyncIterator[LoadResult]:
+        info = parse_github_url(source)
+        if info.is_directory and (scope := get_revision_scope()) is not None:
+            async for result in self._stream_incremental(info, filter or MATCH_ALL, scope):
+                yield result
+        elif info.is_directory and self.mode == "tarball":
+            async for result in self._stream_tarball(info, filter or MATCH_ALL):
+                yield result
+        else:
+            yield await self.load(source, filter)
+
+    def _session(self) -> aiohttp.ClientSession:
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        connector = aiohttp.TCPConnector(limit=self.limiter.max_limit)
+        return aiohttp.ClientSession(headers=headers, connector=connector)
+
+    async def _stream_tarball(
+        self, info: GitRepoInfo, filter: str, ref: str | None = None, paths: set[str] | None = None
+    ) -> AsyncIterator[LoadResult]:
+        """
+        Stream the repository at `ref` (the branch by default). If `paths` is given,
+        only those members are read, otherwise the filter rules apply.
+        """
+        url = f"{self.api_url}/repos/{info.owner}/{info.repo}/tarball/{ref or info.branch}"
+        logger.info("Streaming GitHub tarball", extra={"url": url})
+        skipped = Counter()
+
+        def select(name: str, size: int) -> bool:
+            path = _repo_path(name)
+            if paths is not None:
+                return path in paths
+            return self._select(path, size, info, filter, skipped)
+
+        async with self._session() as session:
+            response = await self._open_stream(session, url)
+            async with response:
+                body = _ResponseReader(response, asyncio.get_running_loop())
+                members = iter_tar_stream(
+                    io.BufferedReader(body, TARBALL_CHUNK_SIZE),
+                    self.archive.config,
+                    mode="r|gz",
+                    compressed_size=lambda: body.bytes_read,
+                    # Member sizes are known from the tar headers, so skipped content is never buffered
+                    select=select,
+                )
+                async for result in self.archive.stream_members(self._repo_members(members)):
+                    yield result
+        _log_skipped(info, skipped)
+
+    async def _stream_incremental(
+        self, info: GitRepoInfo, filter: str, scope: RevisionScope
+    ) -> AsyncIterator[LoadResult]:
+        """
+        Load only the files whose blob SHA differs from the indexed revision.
+
+        The branch head is checked with a conditional request, then the changes since
+        the last indexed commit come from the compare API, or from the recursive tree
+        when there is no such commit or the comparison is incomplete. Files that are
+        not loaded and were not deleted are reported to the scope as unchanged.
+        """
+        previous = scope.remote.get("commit")
+        async with self._session() as session:
+            commit, etag = await self._fetch_head(session, info, scope.remote)
+
+            changes = ({}, set()) if commit == previous else None
+            if changes is None and previous:
+                changes = await self._fetch_compare(session, info, previous, commit)
+
+            skipped = Counter()
+            if changes is None:
+                tree = await self._fetch_tree(session, info, commit)
+                changed = {
+                    path: sha for path, (sha, size) in tree.items()
+                    if scope.known.get(path) != sha and self._select(path, size, info, filter, skipped)
+                }
+                unchanged = {path for path, (sha, _) in tree.items() if scope.known.get(path) == sha}
+            else:
+                modified, removed = changes
+                # The compare API has no file sizes, those are checked once the files are on disk
+                changed = {
+                    path: sha for path, sha in modified.items()
+                    if self._select(path, None, info, filter, skipped)
+                }
+                unchanged = scope.known.keys() - modified.keys() - removed
+            _log_skipped(info, skipped)
+
+            scope.unchanged |= {path for path in unchanged if self._in_scope(path, info, filter)}
+            scope.revisions.update(changed)
+            logger.info("GitHub incremental sync", extra={
+                "repo": f"{info.owner}/{info.repo}",
+                "commit": commit,
+                "previous": previous,
+                "changed": len(changed),
+                "unchanged": len(scope.unchanged),
+            })
+
+            # The first sync and large changes download one tarball instead of many blobs
+            use_tarball = self.mode == "tarball" and (not previous or len(changed) > INCREMENTAL_TARBALL_THRESHOLD)
+            if changed and not use_tarball:
+                tmp_path = make_tmp_dir()
+                await self._fetch_all([
+                    self._fetch_and_store_blob(session, path, sha, info, tmp_path)
+                    for path, sha in changed.items()
+                ])
+                yield LoadResult(documents=[], next_sources=[str(tmp_path)])
+
+        if changed and use_tarball:
+            async for result in self._stream_tarball(info, filter, ref=commit, paths=set(changed)):
+                yield result
+
+        scope.pending_remote = {"commit": commit, "etag": etag}
+
+    @backoff(exception=(ClientError, TimeoutError))
+    async def _fetch_head(
+        self, session: aiohttp.ClientSession, info: GitRepoInfo, remote: dict
+    ) -> tuple[str, str | None]:
+        """
+        Return the head commit SHA of the branch and its ETag. A 304 to the conditional
+        request is free of rate limit and means the previous commit is still the head.
+        """
+        url = f"{self.api_url}/repos/{info.owner}/{info.repo}/commits/{info.branch}"
+        headers = {"Accept": "application/vnd.github.sha"}
+        if remote.get("commit") and remote.get("etag"):
+            headers["If-None-Match"] = remote["etag"]
+
+        async with await self._get(session, url, headers=headers, allow=(304,)) as resp:
+            if resp.status == 304:
+                return remote["commit"], remote["etag"]
+            return (await resp.text()).strip(), resp.headers.get("ETag")
+
+    @backoff(exception=(ClientError, TimeoutError))
+    async def _fetch_compare(
+        self, session: aiohttp.ClientSession, info: GitRepoInfo, base: str, head: str
+    ) -> tuple[dict[str, str], set[str]] | None:
+        """
+        Return the changed paths with their blob SHAs and the removed paths between two commits,
+        or None if the comparison is unusable: the base is gone (404), the head no longer
+        descends from it (force push: "diverged" or "behind", whose files are diffed from
+        the merge base), or the file list is truncated.
+        """
+        url = f"{self.api_url}/repos/{info.owner}/{info.repo}/compare/{base}...{head}"
+        async with await self._get(session, url, allow=(404,)) as resp:
+            if resp.status == 404:
+                return None
+            data = await resp.json()
+
+        if data.get("status") in ("diverged", "behind"):
+            return None
+
+        files = data.get("files", [])
+        if len(files) >= COMPARE_FILES_LIMIT:
+            return None
+
+        changed, removed = {}, set()
+        for entry in files:
+            if entry["status"] == "removed":
+                removed.add(entry["filename"])
+                continue
+            if entry["status"] == "renamed":
+                removed.add(entry["previous_filename"])
+            changed[entry["filename"]] = entry["sha"]
+        return changed, removed
+
+    async def _fetch_tree(
+        self, session: aiohttp.ClientSession, info: GitRepoInfo, ref: str
+    ) -> dict[str, tuple[str, int | None]]:
+        tree_url = f"{self.api_url}/repos/{info.owner}/{info.repo}/git/trees/{ref}?recursive=1"
+        tree_data = await self._fetch_file_metadata(session, tree_url)
+        return {
+            entry["path"]: (entry["sha"], entry.get("size"))
+            for entry in tree_data.get("tree", [])
+            if entry["type"] == "blob"
+        }
+
+    @backoff(exception=(ClientError, TimeoutError))
+    async def _open_stream(self, session: aiohttp.ClientSession, url: str) -> aiohttp.ClientResponse:
+        return await self._get(session, url)
+
+    async def _get(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: dict | None = None,
+        allow: tuple[int, ...] = (),
+    ) -> aiohttp.ClientResponse:
+        """
+        GET under the concurrency limit and the rate limit scheduler. Rate-limited responses
+        are waited out and repeated instead of spending retries, up to MAX_RATE_LIMIT_PAUSES
+        times or MAX_RATE_LIMIT_WAIT seconds; then, like other error statuses not in
+        `allow`, they raise. The caller releases the returned response.
+        """
+        pauses, waited = 0, 0.0
+        while True:
+            await self.scheduler.wait()
+            async with self.limiter.acquire():
+                response = await session.get(url, headers=headers)
+                body = await response.text() if response.status in (403, 429) else ""
+                pause = self.scheduler.observe(response.status, response.headers, body)
+                if pause is not None:
+                    pauses, waited = pauses + 1, waited + pause
+                    if pauses > MAX_RATE_LIMIT_PAUSES or waited > MAX_RATE_LIMIT_WAIT:
+                        logger.warning("Rate limit pauses exhausted", extra={
+                            "url": url, "pauses": pauses, "waited": round(waited),
+                        })
+                        pause = None
+                if pause is None and response.status not in allow:
+                    try:
+                        response.raise_for_status()
+                    except ClientError:
+                        response.release()
+                        raise
+            if pause is None:
+                return response
+            response.release()
+
+    @staticmethod
+    def _repo_members(members: Iterator[ArchiveMember]) -> Iterator[ArchiveMember]:
+        try:
+            for member in members:
+                yield member._replace(name=_repo_path(member.name))
+        finally:
+            members.close()
+
+    def _select(self, path: str, size: int | None, info: GitRepoInfo, filter: str, skipped: Counter) -> bool:
+        if info.path != "." and not path.startswith(info.path.strip("/") + "/"):
+            return False
+        if reason := self.walker.skip_reason(path, filter, size):
+            skipped[reason] += 1
+            record_skip(reason)
+            return False
+        return True
+
+    def _in_scope(self, path: str, info: GitRepoInfo, filter: str) -> bool:
+        # Like _select without counting; files dropped by changed rules then count as deleted
+        if info.path != "." and not path.startswith(info.path.strip("/") + "/"):
+            return False
+        return self.walker.skip_reason(path, filter) in (None, "size")
+
     @backoff(exception=(ClientError, TimeoutError))
     async def _fetch_file_metadata(self, session: aiohttp.ClientSession, url: str) -> dict:
-        async with session.get(url) as resp:
-            resp.raise_for_status()
+        async with await self._get(session, url) as resp:
             return await resp.json()
 
     async def _fetch_and_store_file(self, session: aiohttp.ClientSession, path: str, info, tmp_path: Path):
-        url = f"{self.API_URL}/repos/{info.owner}/{info.repo}/contents/{path}?ref={info.branch}"
+        url = f"{self.api_url}/repos/{info.owner}/{info.repo}/contents/{path}?ref={info.branch}"
         logger.debug("Fetching GitHub file", extra={"url": url})
         data = await self._fetch_file_metadata(session, url)
-        content = data.get("content")
-        encoding = data.get("encoding")
-        if content and encoding == "base64":
-            file_path = tmp_path / path
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            await asyncio.to_thread(file_path.write_bytes, b64decode(content))
-        else:
-            raise ValueError("Unsupported or missing content encoding.")
+        await _store_content(data, tmp_path / path)
 
-    async def _fetch_repository_tree(self, info, tmp_path: Path, session: aiohttp.ClientSession):
-        tree_url = f"{self.API_URL}/repos/{info.owner}/{info.repo}/git/trees/{info.branch}?recursive=1"
-        tree_data = await self._fetch_file_metadata(session, tree_url)
+    async def _fetch_and_store_blob(
+        self, session: aiohttp.ClientSession, path: str, sha: str, info, tmp_path: Path
+    ):
+        url = f"{self.api_url}/repos/{info.owner}/{info.repo}/git/blobs/{sha}"
+        logger.debug("Fetching GitHub blob", extra={"url": url, "path": path})
+        data = await self._fetch_file_metadata(session, url)
+        await _store_content(data, tmp_path / path)
 
-        files = [
-            entry["path"] for entry in tree_data.get("tree", [])
-            if entry["type"] == "blob"
-        ]
+    async def _fetch_repository_tree(self, info, tmp_path: Path, session: aiohttp.ClientSession, filter: str):
+        tree = await self._fetch_tree(session, info, info.branch)
 
-        tasks = [
+        # The tree listing carries paths and sizes, so filtered files are never requested
+        skipped = Counter()
+        files = [path for path, (_, size) in tree.items() if self._select(path, size, info, filter, skipped)]
+        _log_skipped(info, skipped)
+
+        await self._fetch_all([
             self._fetch_and_store_file(session, path, info, tmp_path)
             for path in files
-        ]
+        ])
 
+    async def _fetch_all(self, tasks: list) -> None:
+        self.scheduler.plan(len(tasks))
         iterator = asyncio.as_completed(tasks)
         if self.show_progress:
             iterator = tqdm(iterator, total=len(tasks), desc="Fetching GitHub files")
 
         for coro in iterator:
             await coro
+
+
+async def _store_content(data: dict, file_path: Path) -> None:
+    content = data.get("content")
+    encoding = data.get("encoding")
+    if content and encoding == "base64":
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(file_path.write_bytes, b64decode(content))
+    else:
+        raise ValueError("Unsupported or missing content encoding.")
+
+
+def _repo_path(name: str) -> str:
+    # Tarball members are prefixed with an `owner-repo-sha/` directory
+    return name.partition("/")[2]
+
+
+def _log_skipped(info: GitRepoInfo, skipped: Counter) -> None:
+    if skipped:
+        logger.info("Skipped GitHub files before download", extra={
+            "repo": f"{info.owner}/{info.repo}",
+            "skipped": sum(skipped.values()),
+            **{f"skipped_{reason}": count for reason, count in skipped.items()},
+        })
+
+
+class _ResponseReader(io.RawIOBase):
+    """
+    Blocking file object over an aiohttp response body, for use from a worker thread.
+    Each read waits for the next chunk on the event loop.
+    """
+
+    def __init__(self, response: aiohttp.ClientResponse, loop: asyncio.AbstractEventLoop):
+        self.response = response
+        self.loop = loop
+        self.buffer = b""
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not self.buffer:
+            future = asyncio.run_coroutine_threadsafe(self.response.content.readany(), self.loop)
+            self.buffer = future.result()
+            self.bytes_read += len(self.buffer)
+        n = min(len(b), len(self.buffer))
+        b[:n] = self.buffer[:n]
+        self.buffer = self.buffer[n:]
+        return n
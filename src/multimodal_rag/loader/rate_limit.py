@@ -0,0 +1,128 @@
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from typing import Mapping
+
+from multimodal_rag.log_config import logger
+
+RATE_LIMIT_WINDOW = 3600  # seconds between budget resets of the GitHub REST API
+SECONDARY_LIMIT_PAUSE = 60.0  # first pause on a secondary limit without Retry-After
+MAX_SECONDARY_LIMIT_PAUSE = 900.0
+
+
+class RateLimitScheduler:
+    """
+    Paces requests against a budget reported by X-RateLimit-* response headers.
+
+    While the planned requests fit into the remaining budget they run unpaced.
+    Otherwise the remaining budget is spread evenly until the reset time, so work
+    keeps progressing instead of failing with 403s at the end of the budget.
+    Rate-limited responses (Retry-After, an exhausted budget, secondary limits)
+    pause all requests until the limit lifts; the caller then repeats the request.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None  # epoch seconds
+        self.pending = 0  # planned requests not yet completed
+        self.paused_until = 0.0
+        self.next_slot = 0.0
+        self.secondary_pauses = 0
+
+    def plan(self, requests: int) -> None:
+        """
+        Announce upcoming requests, so pacing can start before the budget runs out.
+        """
+        self.pending += requests
+        self._log_eta("Planned rate-limited requests", requests=requests)
+
+    async def wait(self) -> None:
+        """
+        Wait until the next request may be sent.
+        """
+        while (delay := self.paused_until - time.time()) > 0:
+            await asyncio.sleep(delay)
+
+        now = time.time()
+        if self.reset_at is not None and now >= self.reset_at:
+            # A new window started; the next response reports the actual budget
+            self.remaining, self.reset_at = self.limit, None
+
+        if self.remaining is not None and self.reset_at is not None:
+            if self.remaining <= 0:
+                self._pause(self.reset_at - now + 1, reason="budget_exhausted")
+                return await self.wait()
+            if self.pending > self.remaining:
+                slot = max(self.next_slot, now)
+                self.next_slot = slot + (self.reset_at - now) / self.remaining
+                if slot > now:
+                    await asyncio.sleep(slot - now)
+            self.remaining -= 1
+
+    def observe(self, status: int, headers: Mapping[str, str], body: str = "") -> float | None:
+        """
+        Record the budget reported by a response. Returns the pause in seconds if the
+        response was rate limited and the request has to be repeated, None otherwise.
+        """
+        if (remaining := headers.get("X-RateLimit-Remaining")) is not None:
+            self.remaining = int(remaining)
+        if (reset := headers.get("X-RateLimit-Reset")) is not None:
+            self.reset_at = float(reset)
+        if (limit := headers.get("X-RateLimit-Limit")) is not None:
+            self.limit = int(limit)
+
+        if status not in (403, 429):
+            self.pending = max(self.pending - 1, 0)
+            self.secondary_pauses = 0
+            return None
+
+        if (retry_after := headers.get("Retry-After")) is not None:
+            return self._pause(float(retry_after), reason="retry_after")
+        if self.remaining == 0 and self.reset_at is not None:
+            return self._pause(self.reset_at - time.time() + 1, reason="budget_exhausted")
+        if "rate limit" in body.lower():
+            # Secondary limits without Retry-After: wait at least a minute, longer on repeats
+            delay = min(SECONDARY_LIMIT_PAUSE * 2 ** self.secondary_pauses, MAX_SECONDARY_LIMIT_PAUSE)
+            self.secondary_pauses += 1
+            return self._pause(delay, reason="secondary_limit")
+
+        # A plain 403 (e.g. no access) is an error, not a limit
+        self.pending = max(self.pending - 1, 0)
+        return None
+
+    def eta(self) -> float | None:
+        """
+        Predicted seconds until the pending requests can complete under the budget,
+        not counting request latency. None while the budget is unknown.
+        """
+        if self.remaining is None or self.reset_at is None or not self.limit:
+            return None
+        now = time.time()
+        wait = max(self.paused_until - now, 0.0)
+        if self.pending <= self.remaining:
+            return wait
+        windows = math.ceil((self.pending - self.remaining) / self.limit)
+        return max(self.reset_at - now, wait) + (windows - 1) * RATE_LIMIT_WINDOW
+
+    def _pause(self, delay: float, reason: str) -> float:
+        delay = max(delay, 1.0)
+        until = time.time() + delay
+        if until > self.paused_until + 1:
+            # Concurrent requests hitting the same limit extend the pause only once
+            self.paused_until = until
+            self._log_eta("Rate limited, pausing requests", reason=reason, pause_seconds=round(delay, 1))
+        return delay
+
+    def _log_eta(self, message: str, **extra) -> None:
+        eta = self.eta()
+        logger.info(message, extra={
+            "backend": self.name,
+            "pending": self.pending,
+            "remaining": self.remaining,
+            "eta_seconds": None if eta is None else round(eta, 1),
+            "eta": None if eta is None else datetime.fromtimestamp(time.time() + eta, timezone.utc).isoformat(),
+            **extra,
+        })
@@ -1,124 +1,174 @@
 import asyncio
-import json
 import mimetypes
-import chardet
-import hashlib
-import re
+import os
+from collections import deque
+from concurrent.futures import Executor
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable
 from uuid import uuid4
 
-from langdetect import detect, LangDetectException
-
 from multimodal_rag.document import Document, SourceConfig, MetaConfig
-from multimodal_rag.loader.reader.types import FileReader
+from multimodal_rag.loader.reader.parsing import (
+    PDF_PAGES_PER_TASK,
+    ParsedFile,
+    detect_language,
+    extract_pdf_pages,
+    media_kind,
+    parse_bytes,
+    parse_file,
+    scan_pdf,
+)
+from multimodal_rag.loader.reader.types import FileReader, spill_to_file
 from multimodal_rag.preprocessor.captioner.types import ImageCaptioner
 from multimodal_rag.preprocessor.transcriber.types import AudioTranscriber
 from multimodal_rag.log_config import logger
-from multimodal_rag.utils.loader import load_image_base64, load_file
+from multimodal_rag.utils.image_cache import ImagePayloadCache
+from multimodal_rag.utils.loader import load_image_base64
 from multimodal_rag.utils.timing import log_duration
 
-LANG_EXT = {
-    ".py": "python",
-    ".js": "js",
-    ".ts": "ts",
-    ".java": "java",
-    ".cpp": "cpp",
-    ".c": "c",
-    ".cs": "csharp",
-    ".go": "go",
-    ".php": "php",
-    ".proto": "proto",
-    ".kt": "kotlin",
-    ".rb": "ruby",
-    ".rs": "rust",
-    ".scala": "scala",
-    ".swift": "swift",
-    ".sol": "sol",
-    ".lua": "lua",
-    ".pl": "perl",
-    ".hs": "haskell",
-    ".ex": "elixir",
-    ".ps1": "powershell",
-    ".tex": "latex",
-    ".rst": "rst",
-    ".cob": "cobol",
-}
-
 
 class ExtensionBasedReader(FileReader):
     """
     Reads a file based on its extension and MIME type.
 
-    Supports code, text, markdown, HTML, PDF, DOCX, images, and audio.
+    Supports code, text, markdown, HTML, PDF, DOCX, Jupyter notebooks, images, and audio.
     Uses captioner/transcriber for media if provided.
+    Parsing runs in a worker thread, or in the given process pool executor.
+    PDFs are extracted in page ranges, up to 2 x `workers` ranges at a time (in
+    parallel only with a process executor), and the page start offsets are kept so
+    chunks can carry page numbers. The full text of a PDF is still held in memory.
+    In-memory content is parsed directly; images, audio and PDFs are spilled to
+    temp files, since captioning, embedding and page workers read them by path.
+    With `store_files` other content is spilled too, for the asset store.
+    With `skip_media`, images and audio are only fingerprinted (used for dry runs).
+    Image payloads for the captioner come from the shared `image_cache` if given.
     """
 
-    def __init__(self, transcriber: AudioTranscriber | None = None, captioner: ImageCaptioner | None = None):
+    def __init__(
+        self,
+        transcriber: AudioTranscriber | None = None,
+        captioner: ImageCaptioner | None = None,
+        executor: Executor | None = None,
+        skip_media: bool = False,
+        workers: int | None = None,
+        caption_image_size: int | None = None,
+        image_cache: ImagePayloadCache | None = None,
+        store_files: bool = False,
+    ):
         self.transcriber = transcriber
         self.captioner = captioner
+        self.executor = executor
+        self.skip_media = skip_media
+        self.workers = workers or os.cpu_count() or 1
+        self.caption_image_size = caption_image_size
+        self.image_cache = image_cache
+        self.store_files = store_files
 
     async def load(self, path: Path) -> list[Document]:
         path_str = str(path)
         ext = path.suffix.lower()
-        mime, _ = mimetypes.guess_type(path_str)
-        mime = mime or "application/octet-stream"
+        mime = _guess_mime(path)
 
         logger.debug("Reading file", extra={"path": path_str, "ext": ext, "mime": mime})
+        if ext == ".pdf":
+            return await self._load_pdf(path, mime, tmp_uri=path_str)
 
-        if ext in LANG_EXT:
-            content = await self._read_text(path_str)
-            content_type = f"code_{LANG_EXT[ext]}"
-        elif ext == ".json":
-            content = await self._read_json(path_str)
-            content_type = "json"
-        elif ext in {".txt", "", ".csv"}:
-            content = await self._read_text(path_str)
-            content_type = "text"
-        elif ext == ".md":
-            content = await self._read_text(path_str)
-            content_type = "markdown"
-        elif ext == ".html":
-            content = await self._read_html(path_str)
-            content_type = "markdown"
-        elif ext == ".pdf":
-            content = await self._read_pdf(path_str)
-            content_type = "text"
-        elif ext == ".docx":
-            content = await self._read_docx(path_str)
-            content_type = "text"
-        else:
-            if mime.startswith("image/"):
-                content = await self._caption_image(path_str)
-                content_type = "image"
-            elif mime.startswith("audio/"):
-                content = await self._transcribe_audio(path_str, mime)
-                content_type = "text"
-            else:
-                content = ""
-                content_type = "blob"
+        async with log_duration("parse_file", path=path_str, backend="process" if self.executor else "thread"):
+            parsed = await self._run(parse_file, path_str, ext, mime)
 
-        try:
-            lang = detect(content) if content else ""
-        except LangDetectException:
-            lang = ""
-            logger.debug("Language detection failed", extra={"path": path_str})
+        return await self._build(parsed, path, mime, tmp_uri=path_str)
 
-        size_bytes = path.stat().st_size
-        last_modified = int(path.stat().st_mtime)
-        fingerprint = await self._hash_file(path)
+    async def load_bytes(self, data: bytes, path: Path) -> list[Document]:
+        ext = path.suffix.lower()
+        mime = _guess_mime(path)
+        if media_kind(ext, mime):
+            return await self.load(await spill_to_file(data, path))
+        if ext == ".pdf":
+            # Page range workers open the PDF by path instead of receiving a copy of the bytes
+            tmp_path = await spill_to_file(data, path)
+            return await self._load_pdf(tmp_path, mime, tmp_uri=str(tmp_path))
+
+        async with log_duration("parse_bytes", path=str(path), backend="process" if self.executor else "thread"):
+            parsed = await self._run(parse_bytes, data, ext, mime)
+
+        tmp_uri = str(await spill_to_file(data, path)) if self.store_files else None
+        return await self._build(parsed, path, mime, tmp_uri=tmp_uri)
+
+    async def _load_pdf(self, path: Path, mime: str, tmp_uri: str | None) -> list[Document]:
+        path_str = str(path)
+        async with log_duration("parse_pdf", path=path_str, backend="process" if self.executor else "thread"):
+            fingerprint, size_bytes, last_modified, page_count = await self._run(scan_pdf, path_str)
+            pages, page_offsets, offset = [], [], 0
+            async for text in self._pdf_pages(path_str, page_count):
+                pages.append(text)
+                page_offsets.append(offset)
+                offset += len(text) + 1
+            content = "\n".join(pages)
+
+        parsed = ParsedFile(
+            content=content,
+            content_type="text",
+            lang=await asyncio.to_thread(detect_language, content, "text", fingerprint),
+            fingerprint=fingerprint,
+            size_bytes=size_bytes,
+            last_modified=last_modified,
+            page_offsets=page_offsets,
+        )
+        return await self._build(parsed, path, mime, tmp_uri=tmp_uri)
+
+    async def _pdf_pages(self, path: str, page_count: int) -> AsyncIterator[str]:
+        """
+        Yield page texts in page order. Page ranges are extracted ahead in a bounded
+        window, which bounds the parsed page objects held at once. The caller still
+        joins the whole text: Document.content is journaled and stored whole, so
+        chunking pages as they arrive would not bound a document's memory either.
+        Ranges only run in parallel with a process executor, pypdf holds the GIL.
+        """
+        window: deque[asyncio.Future] = deque()
+        try:
+            for start in range(0, page_count, PDF_PAGES_PER_TASK):
+                window.append(asyncio.ensure_future(
+                    self._run(extract_pdf_pages, path, start, start + PDF_PAGES_PER_TASK)
+                ))
+                if len(window) >= 2 * self.workers:
+                    for text in await window.popleft():
+                        yield text
+            while window:
+                for text in await window.popleft():
+                    yield text
+        finally:
+            for future in window:
+                future.cancel()
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        if self.executor:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def _build(self, parsed: ParsedFile, path: Path, mime: str, tmp_uri: str | None) -> list[Document]:
+        path_str = str(path)
+        content, lang = parsed.content, parsed.lang
+        if not self.skip_media:
+            if parsed.media == "image":
+                content = await self._caption_image(path_str, parsed.fingerprint)
+            elif parsed.media == "audio":
+                content = await self._transcribe_audio(path_str, mime)
+            if parsed.media and content:
+                lang = await asyncio.to_thread(detect_language, content, parsed.content_type, parsed.fingerprint)
 
         source_config = SourceConfig(
-            tmp_uri=path_str,
+            tmp_uri=tmp_uri,
             file_reader="extension_based",
-            parsed_format=content_type,
+            parsed_format=parsed.content_type,
         )
 
         meta_config = MetaConfig(
             mime=mime,
             filename=path.name,
-            size_bytes=size_bytes,
-            last_modified=last_modified,
-            fingerprint=fingerprint,
+            size_bytes=parsed.size_bytes,
+            last_modified=parsed.last_modified,
+            fingerprint=parsed.fingerprint,
         )
 
         return [Document(
@@ -128,16 +178,20 @@ class ExtensionBasedReader(FileReader):
             tags=[],
             source=source_config,
             metadata=meta_config,
-            chunk_groups=[]
+            chunk_groups=[],
+            page_offsets=parsed.page_offsets,
         )]
 
-    async def _caption_image(self, path: str) -> str:
+    async def _caption_image(self, path: str, fingerprint: str) -> str:
         if not self.captioner:
             logger.warning("Captioner not provided; returning empty string.", extra={"file": path})
             return ""
         try:
             async with log_duration("caption_image", path=path):
-                image_base64 = await load_image_base64(path)
+                if self.image_cache:
+                    image_base64 = await self.image_cache.get(fingerprint, path)
+                else:
+                    image_base64 = await load_image_base64(path, self.caption_image_size)
                 captions = await self.captioner.generate_captions([image_base64])
                 return captions[0] if captions else ""
         except Exception as e:
@@ -150,89 +204,12 @@ class ExtensionBasedReader(FileReader):
             return ""
         try:
             async with log_duration("transcribe_audio", path=path):
-                audio_bytes = await load_file(path)
-                return await self.transcriber.transcribe(audio_bytes, mime)
+                return await self.transcriber.transcribe(Path(path), mime)
         except Exception as e:
             logger.exception("Failed to transcribe audio", extra={"file": path, "error": str(e)})
             return ""
 
-    async def _read_text(self, path: str) -> str:
-        async with log_duration("read_text", path=path):
-            def read():
-                with open(path, 'rb') as f:
-                    raw_start = f.read(2048)
-                encoding = chardet.detect(raw_start).get("encoding", "utf-8")
-                with open(path, encoding=encoding, errors="replace") as f:
-                    return f.read()
-            return await asyncio.to_thread(read)
-
-    async def _read_html(self, path: str) -> str:
-        try:
-            from markdownify import markdownify as md
-        except ImportError:
-            raise ImportError("markdownify is required to convert HTML.")
-
-        try:
-            from bs4 import BeautifulSoup
-        except ImportError:
-            raise ImportError("beautifulsoup4 (bs4) is required to clean up HTML.")
-
-        html = await self._read_text(path)
 
-        def to_markdown(html: str) -> str:
-            soup = BeautifulSoup(html, "html.parser")
-
-            for tag in soup.select("nav, header, footer, aside, .sr-only, .tooltipped, .octicon, script, style"):
-                tag.decompose()
-
-            content = soup.select_one("article.markdown-body") or soup.find("body")
-            markdown = md(str(content))
-            markdown = re.sub(r'\n{3,}', '\n\n', markdown)
-            markdown = "\n".join(line for line in markdown.splitlines() if line.strip())
-
-            return markdown.strip()
-
-        async with log_duration("read_html", path=path):
-            return await asyncio.to_thread(to_markdown, html)
-
-    async def _read_pdf(self, path: str) -> str:
-        try:
-            from pypdf import PdfReader
-        except ImportError:
-            raise ImportError("pypdf is required to read PDF files.")
-        async with log_duration("read_pdf", path=path):
-            def extract_pdf():
-                reader = PdfReader(path)
-                return "\n".join(page.extract_text() or "" for page in reader.pages)
-            return await asyncio.to_thread(extract_pdf)
-
-    async def _read_docx(self, path: str) -> str:
-        try:
-            import docx
-        except ImportError:
-            raise ImportError("python-docx is required to read DOCX files.")
-        async with log_duration("read_docx", path=path):
-            def extract_docx():
-                doc = docx.Document(path)
-                return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-            return await asyncio.to_thread(extract_docx)
-
-    async def _read_json(self, path: str) -> str:
-        async with log_duration("read_json", path=path):
-            def parse_json():
-                with open(path, 'rb') as f:
-                    raw = f.read()
-                encoding = chardet.detect(raw).get("encoding", "utf-8")
-                data = json.loads(raw.decode(encoding, errors="replace"))
-                return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-            return await asyncio.to_thread(parse_json)
-
-    async def _hash_file(self, path: Path) -> str:
-        def hash_file():
-            hasher = hashlib.sha256()
-            with path.open("rb") as f:
-                while chunk := f.read(8192):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-
-        return await asyncio.to_thread(hash_file)
+def _guess_mime(path: Path) -> str:
+    mime, _ = mimetypes.guess_type(str(path))
+    return mime or "application/octet-stream"
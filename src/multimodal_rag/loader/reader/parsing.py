@@ -0,0 +1,453 @@
+"""
+Synchronous file parsers used by ExtensionBasedReader.
+
+Everything here is CPU-bound and runs either in a thread or in a worker process,
+so functions must stay at module level and return picklable values.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+
+import chardet
+from langdetect import DetectorFactory, detect, LangDetectException
+
+from multimodal_rag.config.schema import LoadingConfig
+
+LANG_EXT = {
+    ".py": "python",
+    ".js": "js",
+    ".ts": "ts",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".cs": "csharp",
+    ".go": "go",
+    ".php": "php",
+    ".proto": "proto",
+    ".kt": "kotlin",
+    ".rb": "ruby",
+    ".rs": "rust",
+    ".scala": "scala",
+    ".swift": "swift",
+    ".sol": "sol",
+    ".lua": "lua",
+    ".pl": "perl",
+    ".hs": "haskell",
+    ".ex": "elixir",
+    ".ps1": "powershell",
+    ".tex": "latex",
+    ".rst": "rst",
+    ".cob": "cobol",
+}
+
+
+class ParsedFile(NamedTuple):
+    content: str
+    content_type: str
+    lang: str
+    fingerprint: str
+    size_bytes: int
+    last_modified: int
+    media: str | None = None  # "image" / "audio" when content must come from a captioner/transcriber
+    page_offsets: list[int] | None = None  # content offset where each page starts, for paged formats
+
+
+def parse_workers(config: LoadingConfig) -> int:
+    return config.parser_workers or os.cpu_count() or 1
+
+
+def create_parse_executor(config: LoadingConfig) -> Executor | None:
+    """
+    Create the process pool for the "process" parser backend, or None for the thread backend.
+    """
+    if config.parser_backend != "process":
+        return None
+    # spawn avoids forking a process that already runs an event loop and worker threads
+    return ProcessPoolExecutor(
+        max_workers=parse_workers(config),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+PARSED_EXT = {*LANG_EXT, ".json", ".txt", "", ".csv", ".md", ".html", ".pdf", ".docx", ".ipynb"}
+STREAMED_EXT = {".ipynb"}  # parsed from the open file, never read into memory whole
+NOTEBOOK_CELL_PREFIXES = {"cells.item", "worksheets.item.cells.item"}  # nbformat 4, nbformat 3
+PDF_PAGES_PER_TASK = 25  # pages extracted per worker task
+NOTEBOOK_OUTPUT_CHARS = 2000  # text kept per notebook cell output
+SNIFF_BYTES = 2048  # prefix given to chardet when the content is not UTF-8
+HASH_CHUNK_SIZE = 1024 * 1024
+LANG_SAMPLE_CHARS = 3000  # characters given to langdetect, taken from the start, middle and end
+LANG_CACHE_SIZE = 10_000
+NO_LANG_TYPES = {"image", "blob"}  # besides code_* formats
+
+# langdetect is randomized; a fixed seed makes results reproducible and cacheable
+DetectorFactory.seed = 0
+_lang_cache: dict[str, str] = {}  # fingerprint -> language, per process
+_lang_cache_lock = threading.Lock()
+
+
+def media_kind(ext: str, mime: str) -> str | None:
+    """
+    Return "image" or "audio" for files whose content comes from a captioner/transcriber.
+    """
+    if ext in PARSED_EXT:
+        return None
+    if mime.startswith("image/"):
+        return "image"
+    if mime.startswith("audio/"):
+        return "audio"
+    return None
+
+
+def parse_file(path: str, ext: str, mime: str) -> ParsedFile:
+    """
+    Parse a file into the finished Document fields, opening and reading it once:
+    the same bytes are hashed, decoded and parsed, and stat comes from the open handle.
+    Notebooks are parsed from the open handle and hashed as they are read.
+    Images, audio and unknown formats are only fingerprinted, in chunks;
+    media content is produced by the reader.
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if ext in STREAMED_EXT:
+            reader = _HashingReader(f)
+            content = parse_notebook(reader)
+            fingerprint = reader.hexdigest()
+            return ParsedFile(
+                content=content,
+                content_type="markdown",
+                lang=detect_language(content, "markdown", fingerprint),
+                fingerprint=fingerprint,
+                size_bytes=stat.st_size,
+                last_modified=int(stat.st_mtime),
+            )
+        if ext not in PARSED_EXT:
+            fingerprint = _hash_stream(f)
+            data = None
+        else:
+            data = f.read()
+
+    if data is not None:
+        return parse_bytes(data, ext, mime)._replace(last_modified=int(stat.st_mtime))
+
+    # The content was not read: formats outside PARSED_EXT never call these providers
+    content, content_type, media = _parse_content(
+        ext, mime, text=lambda: "", raw=lambda: b"", binary=lambda: io.BytesIO(b"")
+    )
+    return ParsedFile(
+        content=content,
+        content_type=content_type,
+        lang="",
+        fingerprint=fingerprint,
+        size_bytes=stat.st_size,
+        last_modified=int(stat.st_mtime),
+        media=media,
+    )
+
+
+def parse_bytes(data: bytes, ext: str, mime: str) -> ParsedFile:
+    """
+    Parse in-memory file content (e.g. an archive member) into the Document fields.
+    The caller provides the modification time.
+    """
+    content, content_type, media = _parse_content(
+        ext,
+        mime,
+        text=lambda: decode_text(data),
+        raw=lambda: data,
+        binary=lambda: io.BytesIO(data),
+    )
+    fingerprint = hashlib.sha256(data).hexdigest()
+    return ParsedFile(
+        content=content,
+        content_type=content_type,
+        lang=detect_language(content, content_type, fingerprint),
+        fingerprint=fingerprint,
+        size_bytes=len(data),
+        last_modified=0,
+        media=media,
+    )
+
+
+def _parse_content(
+    ext: str,
+    mime: str,
+    text: Callable[[], str],
+    raw: Callable[[], bytes],
+    binary: Callable[[], str | BinaryIO],
+) -> tuple[str, str, str | None]:
+    """
+    Dispatch on the extension. `text`, `raw` and `binary` lazily provide the decoded text,
+    the bytes, and a path or file object for binary document parsers.
+    """
+    media = None
+    if ext in LANG_EXT:
+        content = text()
+        content_type = f"code_{LANG_EXT[ext]}"
+    elif ext == ".json":
+        content = parse_json(raw())
+        content_type = "json"
+    elif ext in {".txt", "", ".csv"}:
+        content = text()
+        content_type = "text"
+    elif ext == ".md":
+        content = text()
+        content_type = "markdown"
+    elif ext == ".html":
+        content = html_to_markdown(text())
+        content_type = "markdown"
+    elif ext == ".ipynb":
+        content = parse_notebook(binary())
+        content_type = "markdown"
+    elif ext == ".pdf":
+        content = read_pdf(binary())
+        content_type = "text"
+    elif ext == ".docx":
+        content = read_docx(binary())
+        content_type = "text"
+    else:
+        content = ""
+        media = media_kind(ext, mime)
+        if media == "image":
+            content_type = "image"
+        elif media == "audio":
+            content_type = "text"
+        else:
+            content_type = "blob"
+    return content, content_type, media
+
+
+def detect_language(content: str, content_type: str = "text", fingerprint: str | None = None) -> str:
+    """
+    Detect the natural language of a bounded sample of the content.
+    Code and binary formats get no language. Results are cached by file fingerprint.
+    """
+    if not content or content_type.startswith("code_") or content_type in NO_LANG_TYPES:
+        return ""
+    if fingerprint and (lang := _lang_cache.get(fingerprint)) is not None:
+        return lang
+
+    try:
+        lang = detect(_lang_sample(content))
+    except LangDetectException:
+        lang = ""
+
+    if fingerprint:
+        with _lang_cache_lock:
+            if len(_lang_cache) >= LANG_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del _lang_cache[next(iter(_lang_cache))]
+            _lang_cache[fingerprint] = lang
+    return lang
+
+
+def _lang_sample(content: str) -> str:
+    if len(content) <= LANG_SAMPLE_CHARS:
+        return content
+    part = LANG_SAMPLE_CHARS // 3
+    middle = (len(content) - part) // 2
+    return "\n".join((content[:part], content[middle:middle + part], content[-part:]))
+
+
+def decode_text(raw: bytes) -> str:
+    """
+    Decode as UTF-8 (and thus ASCII) first, which covers nearly all files without
+    sniffing; only other content goes through chardet.
+    """
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        pass
+    encoding = chardet.detect(raw[:SNIFF_BYTES]).get("encoding") or "utf-8"
+    try:
+        return raw.decode(encoding, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def parse_json(raw: bytes) -> str:
+    data = json.loads(decode_text(raw))
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def parse_notebook(f: str | BinaryIO) -> str:
+    """
+    Render a Jupyter notebook (nbformat 3 or 4) as markdown: markdown cells as they are,
+    code cells as fenced blocks followed by their text output, truncated to
+    NOTEBOOK_OUTPUT_CHARS. Images, HTML and other rich outputs are dropped. With ijson
+    installed cells are parsed one at a time, so a notebook's output blobs are never
+    all in memory at once.
+    """
+    with open(f, "rb") if isinstance(f, str) else f:
+        try:
+            import ijson
+            cells = _stream_cells(ijson, f)
+        except ImportError:
+            notebook = json.load(f)
+            cells = notebook.get("cells") or [
+                cell for sheet in notebook.get("worksheets", []) for cell in sheet.get("cells", [])
+            ]
+
+        parts = []
+        for cell in cells:
+            # nbformat 3 keeps code in "input" and heading cells apart from markdown
+            source = _join_lines(cell.get("source", cell.get("input", ""))).strip()
+            if cell.get("cell_type") == "code":
+                if source:
+                    parts.append(f"```\n{source}\n```")
+                if output := _cell_output(cell.get("outputs", [])):
+                    parts.append(f"Output:\n```\n{output}\n```")
+            elif cell.get("cell_type") == "heading" and source:
+                parts.append(f"{'#' * cell.get('level', 1)} {source}")
+            elif source:
+                parts.append(source)
+    return "\n\n".join(parts)
+
+
+def _stream_cells(ijson, f: BinaryIO) -> Iterator[dict]:
+    # Builds one cell at a time, wherever the nbformat version keeps them
+    builder = None
+    for prefix, event, value in ijson.parse(f):
+        if builder is None:
+            if prefix not in NOTEBOOK_CELL_PREFIXES or event != "start_map":
+                continue
+            builder = ijson.ObjectBuilder()
+        builder.event(event, value)
+        if prefix in NOTEBOOK_CELL_PREFIXES and event == "end_map":
+            yield builder.value
+            builder = None
+
+
+def _cell_output(outputs: list[dict]) -> str:
+    texts = []
+    for output in outputs:
+        kind = output.get("output_type")
+        if kind == "stream":
+            texts.append(_join_lines(output.get("text", "")))
+        elif kind in ("execute_result", "display_data"):
+            texts.append(_join_lines(output.get("data", {}).get("text/plain", "")))
+        elif kind == "pyout":
+            # nbformat 3 keeps the plain text representation on the output itself
+            texts.append(_join_lines(output.get("text", "")))
+        elif kind in ("error", "pyerr"):
+            # Tracebacks are ANSI-coloured frames; the error line says what went wrong
+            texts.append(f"{output.get('ename', '')}: {output.get('evalue', '')}")
+    text = "\n".join(t.rstrip() for t in texts if t.strip())
+    if len(text) > NOTEBOOK_OUTPUT_CHARS:
+        text = f"{text[:NOTEBOOK_OUTPUT_CHARS]}\n... [{len(text) - NOTEBOOK_OUTPUT_CHARS} characters truncated]"
+    return text
+
+
+def _join_lines(value: str | list[str]) -> str:
+    # nbformat stores multiline strings as lists of lines
+    return "".join(value) if isinstance(value, list) else value
+
+
+def html_to_markdown(html: str) -> str:
+    try:
+        from markdownify import markdownify as md
+    except ImportError:
+        raise ImportError("markdownify is required to convert HTML.")
+
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        raise ImportError("beautifulsoup4 (bs4) is required to clean up HTML.")
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup.select("nav, header, footer, aside, .sr-only, .tooltipped, .octicon, script, style"):
+        tag.decompose()
+
+    content = soup.select_one("article.markdown-body") or soup.find("body")
+    markdown = md(str(content))
+    markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+    markdown = "\n".join(line for line in markdown.splitlines() if line.strip())
+
+    return markdown.strip()
+
+
+def read_pdf(path: str | BinaryIO) -> str:
+    reader = _pdf_reader_class()(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def scan_pdf(path: str) -> tuple[str, int, int, int]:
+    """
+    Fingerprint a PDF and count its pages without extracting any text.
+    Returns (fingerprint, size_bytes, last_modified, page_count).
+    """
+    PdfReader = _pdf_reader_class()
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        fingerprint = _hash_stream(f)
+        f.seek(0)
+        page_count = len(PdfReader(f).pages)
+    return fingerprint, stat.st_size, int(stat.st_mtime), page_count
+
+
+def extract_pdf_pages(path: str, start: int, stop: int) -> list[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF. Each call opens its own reader,
+    so page ranges can be extracted in parallel and parsed pages are freed afterwards.
+    """
+    PdfReader = _pdf_reader_class()
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, min(stop, len(reader.pages)))]
+
+
+def _pdf_reader_class():
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("pypdf is required to read PDF files.")
+    return PdfReader
+
+
+def read_docx(path: str | BinaryIO) -> str:
+    try:
+        import docx
+    except ImportError:
+        raise ImportError("python-docx is required to read DOCX files.")
+    doc = docx.Document(path)
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+class _HashingReader:
+    """
+    File wrapper hashing the bytes as a parser reads them; the rest is hashed at the end.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self._hasher.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        while self.read(HASH_CHUNK_SIZE):
+            pass
+        return self._hasher.hexdigest()
+
+    def __enter__(self) -> "_HashingReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+def _hash_stream(f: BinaryIO) -> str:
+    hasher = hashlib.sha256()
+    while chunk := f.read(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
@@ -1,6 +1,8 @@
+import asyncio
 from pathlib import Path
 from typing import Protocol
 from multimodal_rag.document import Document
+from multimodal_rag.utils.temp_dirs import make_tmp_dir
 
 
 class FileReader(Protocol):
@@ -10,3 +12,16 @@ class FileReader(Protocol):
 
     async def load(self, path: Path) -> list[Document]:
         ...
+
+    async def load_bytes(self, data: bytes, path: Path) -> list[Document]:
+        """
+        Read in-memory file content, e.g. an archive member; `path` is its relative name.
+        Readers without in-memory support spill it to a temp file and `load` that.
+        """
+        return await self.load(await spill_to_file(data, path))
+
+
+async def spill_to_file(data: bytes, path: Path) -> Path:
+    tmp_path = make_tmp_dir(prefix="member_") / path.name
+    await asyncio.to_thread(tmp_path.write_bytes, data)
+    return tmp_path
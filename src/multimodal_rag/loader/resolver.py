@@ -1,11 +1,16 @@
 from pathlib import Path
+from multimodal_rag.config.schema import LoadingConfig
+from multimodal_rag.loader.git import GitLoader
 from multimodal_rag.loader.github import GitHubRepoLoader
 from multimodal_rag.loader.archive import ArchiveLoader
-from multimodal_rag.loader.directory import DirectoryLoader
+from multimodal_rag.loader.directory import DirectoryLoader, DEFAULT_MAX_CONCURRENCY
 from multimodal_rag.loader.types import DocumentLoader
-from multimodal_rag.loader.utils import is_archive, is_github_url
+from multimodal_rag.loader.walker import DirectoryWalker, DEFAULT_IGNORED_DIRS
+from multimodal_rag.loader.utils import is_archive, is_git_url, is_github_url
+from multimodal_rag.loader.reader.parsing import parse_workers
 from multimodal_rag.loader.reader.registry import ReaderRegistry
 from multimodal_rag.log_config import logger
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
 
 
 class SourceResolver:
@@ -13,8 +18,9 @@ class SourceResolver:
     Resolves the appropriate loader for the given source path or URL.
     """
 
-    def __init__(self, registry: ReaderRegistry):
+    def __init__(self, registry: ReaderRegistry, config: LoadingConfig | None = None):
         self.registry = registry
+        self.config = config or LoadingConfig()
         self.loader_cache: dict[str, DocumentLoader] = {}
 
     def resolve_loader(self, source: str) -> tuple[DocumentLoader, str]:
@@ -25,11 +31,19 @@ class SourceResolver:
 
         match kind:
             case "github":
-                loader = GitHubRepoLoader(self.registry)
+                loader = GitHubRepoLoader(
+                    self.registry,
+                    limiter=AdaptiveLimiter("github", self.config.github_concurrency),
+                    mode=self.config.github_mode,
+                    archive=self._archive_loader(),
+                    walker=self._walker(),
+                )
+            case "git":
+                loader = GitLoader(self.registry, archive=self._archive_loader(), walker=self._walker())
             case "archive":
-                loader = ArchiveLoader(self.registry)
+                loader = self._archive_loader()
             case "directory" | "file":
-                loader = DirectoryLoader(self.registry)
+                loader = DirectoryLoader(self.registry, limiter=self._file_limiter(), walker=self._walker())
             case _:
                 raise RuntimeError(f"Unreachable state in resolve_loader (kind: {kind})")
 
@@ -37,9 +51,36 @@ class SourceResolver:
         logger.info("Resolved loader", extra={"loader": type(loader).__name__, "source": source})
         return loader, kind
 
+    def _archive_loader(self) -> ArchiveLoader:
+        return ArchiveLoader(
+            self.registry, config=self.config.archive, limiter=self._file_limiter(), walker=self._walker()
+        )
+
+    def _walker(self) -> DirectoryWalker:
+        return DirectoryWalker(
+            include=self.config.include,
+            exclude=self.config.exclude,
+            gitignore=self.config.gitignore,
+            ignored_dirs=DEFAULT_IGNORED_DIRS if self.config.ignored_dirs is None else self.config.ignored_dirs,
+            max_file_size=self.config.max_file_size,
+            extensions=self.config.extensions,
+        )
+
+    def _file_limiter(self) -> AdaptiveLimiter:
+        if self.config.file_concurrency:
+            return AdaptiveLimiter("files", self.config.file_concurrency)
+        if self.config.max_concurrency:
+            return AdaptiveLimiter.fixed("files", self.config.max_concurrency)
+        if self.config.parser_backend == "process":
+            # Keep every worker process busy while other files wait on I/O
+            return AdaptiveLimiter.fixed("files", 2 * parse_workers(self.config))
+        return AdaptiveLimiter.fixed("files", DEFAULT_MAX_CONCURRENCY)
+
     def _detect_source_type(self, source: str):
         p = Path(source)
-        if is_github_url(source):
+        if is_git_url(source):
+            detected = "git"
+        elif is_github_url(source):
             detected = "github"
         elif p.is_dir():
             detected = "directory"
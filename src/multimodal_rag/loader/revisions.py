@@ -0,0 +1,45 @@
+from contextvars import ContextVar
+
+
+class RevisionScope:
+    """
+    Per-run exchange between remote loaders and the incremental sync.
+
+    Remote loaders that can tell unchanged files from metadata alone (e.g. git blob SHAs)
+    leave them out and report them as `unchanged` instead of downloading them again.
+    """
+
+    def __init__(self, known: dict[str, str], remote: dict):
+        self.known = known  # path -> revision of the indexed version
+        self.remote = remote  # loader state of the last complete run, e.g. commit SHA and ETag
+        self.revisions: dict[str, str] = {}  # path -> revision of the files loaded in this run
+        self.unchanged: set[str] = set()
+        self.pending_remote: dict | None = None  # becomes `remote` once this run completed
+
+    def state(self) -> dict:
+        return {
+            "revisions": self.revisions,
+            "unchanged": sorted(self.unchanged),
+            "pending_remote": self.pending_remote,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.revisions = state["revisions"]
+        self.unchanged = set(state["unchanged"])
+        self.pending_remote = state["pending_remote"]
+
+
+_scope: ContextVar[RevisionScope | None] = ContextVar("revision_scope", default=None)
+
+
+def open_revision_scope(known: dict[str, str], remote: dict) -> RevisionScope:
+    """
+    Make revisions of the previous run available to loaders in the current task and the tasks it spawns.
+    """
+    scope = RevisionScope(known, remote)
+    _scope.set(scope)
+    return scope
+
+
+def get_revision_scope() -> RevisionScope | None:
+    return _scope.get()
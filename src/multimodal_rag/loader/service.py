@@ -1,4 +1,6 @@
 import asyncio
+from pathlib import Path
+from typing import AsyncIterator
 
 from multimodal_rag.document import Document
 from multimodal_rag.loader.types import LoadResult
@@ -16,9 +18,17 @@ class RecursiveLoaderService:
         self.max_depth = max_depth
 
     async def load(self, source: str, filter: str = "**/*") -> list[Document]:
-        return await self._load_recursive(source, filter, depth=0)
+        return await self._load_recursive(source, filter, depth=0, prefix="")
 
-    async def _load_recursive(self, source: str, filter: str, depth: int) -> list[Document]:
+    async def stream(self, source: str, filter: str = "**/*") -> AsyncIterator[Document]:
+        """
+        Yield documents one by one as loaders produce them.
+        Nested sources (archives, fetched repositories) are streamed depth-first.
+        """
+        async for doc in self._stream_recursive(source, filter, depth=0, prefix=""):
+            yield doc
+
+    async def _load_recursive(self, source: str, filter: str, depth: int, prefix: str) -> list[Document]:
         if depth > self.max_depth:
             raise RuntimeError(f"Max recursion depth exceeded: {source}")
 
@@ -27,14 +37,47 @@ class RecursiveLoaderService:
 
         result: LoadResult = await loader.load(source, filter)
 
-        documents = list(result.documents)
+        documents = [self._with_prefix(doc, prefix) for doc in result.documents]
 
         if result.next_sources:
             sub_results = await asyncio.gather(*[
-                self._load_recursive(str(sub), filter, depth + 1)
+                self._load_recursive(str(sub), filter, depth + 1, self._sub_prefix(source, str(sub), prefix))
                 for sub in result.next_sources
             ])
             for sub_docs in sub_results:
                 documents.extend(sub_docs)
 
         return documents
+
+    async def _stream_recursive(self, source: str, filter: str, depth: int, prefix: str) -> AsyncIterator[Document]:
+        if depth > self.max_depth:
+            raise RuntimeError(f"Max recursion depth exceeded: {source}")
+
+        loader, kind = self.resolver.resolve_loader(source)
+        logger.info("Streaming from loader", extra={"loader": type(loader).__name__, "source": source})
+
+        async for result in loader.stream(source, filter):
+            for doc in result.documents:
+                yield self._with_prefix(doc, prefix)
+
+            for sub in result.next_sources:
+                sub_prefix = self._sub_prefix(source, str(sub), prefix)
+                async for doc in self._stream_recursive(str(sub), filter, depth + 1, sub_prefix):
+                    yield doc
+
+    @staticmethod
+    def _sub_prefix(source: str, sub: str, prefix: str) -> str:
+        """
+        Nested sources found inside the source (e.g. archives in a directory) extend
+        the relative path prefix; extracted temp folders keep the parent's prefix.
+        """
+        sub_path, source_path = Path(sub), Path(source)
+        if source_path.is_dir() and sub_path.is_relative_to(source_path):
+            return f"{prefix}{sub_path.relative_to(source_path).as_posix()}/"
+        return prefix
+
+    @staticmethod
+    def _with_prefix(doc: Document, prefix: str) -> Document:
+        if prefix and doc.metadata.path:
+            doc.metadata.path = prefix + doc.metadata.path
+        return doc
@@ -0,0 +1,23 @@
+from collections import Counter
+from contextvars import ContextVar
+
+_skips: ContextVar[Counter | None] = ContextVar("skipped_files", default=None)
+
+
+def open_skip_scope() -> Counter:
+    """
+    Count files filtered out before reading or downloading them, by reason,
+    for the current task and the tasks it spawns. Returns the live counter.
+    """
+    skips = Counter()
+    _skips.set(skips)
+    return skips
+
+
+def record_skip(reason: str, count: int = 1) -> None:
+    if (skips := _skips.get()) is not None:
+        skips[reason] += count
+
+
+def skip_counts() -> dict[str, int]:
+    return dict(_skips.get() or {})
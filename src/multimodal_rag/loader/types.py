@@ -17,3 +17,10 @@ class DocumentLoader(Protocol):
         Load documents from the source and return them along with any additional sources to process.
         """
         ...
+
+    async def stream(self, source: str, filter: str | None = None) -> AsyncIterator[LoadResult]:
+        """
+        Yield partial load results as soon as they are available.
+        Loaders without incremental support yield a single result from `load`.
+        """
+        yield await self.load(source, filter)
@@ -3,6 +3,8 @@ from urllib.parse import urlparse
 from typing import NamedTuple
 from multimodal_rag.constants import SUPPORTED_ARCHIVES, KNOWN_BUT_UNSUPPORTED
 
+GIT_SCHEME = "git+file://"
+
 
 class GitRepoInfo(NamedTuple):
     owner: str
@@ -27,6 +29,25 @@ def is_github_url(path: str) -> bool:
         return False
 
 
+def is_git_url(path: str) -> bool:
+    return path.startswith(GIT_SCHEME)
+
+
+def parse_git_url(url: str) -> tuple[Path, str]:
+    """
+    Parses a local repository URL `git+file:///path/to/repo[@ref]` into the repo path and ref.
+    The ref defaults to HEAD.
+    """
+    location = url[len(GIT_SCHEME):]
+    path, sep, ref = location.rpartition("@")
+    if not sep or "/" in ref:
+        # No ref, or the `@` belongs to a directory name
+        path, ref = location, "HEAD"
+    if not path:
+        raise ValueError(f"Invalid git URL: {url}")
+    return Path(path), ref or "HEAD"
+
+
 def parse_github_url(url: str) -> GitRepoInfo:
     """
     Parses a GitHub URL and returns repo metadata. Supports:
@@ -0,0 +1,230 @@
+import functools
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator
+
+from multimodal_rag.loader.skips import record_skip
+
+DEFAULT_IGNORED_DIRS = (
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    "__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    ".venv", "venv", ".eggs",
+)
+
+MATCH_ALL = "**/*"
+
+
+class IgnoreRules:
+    """
+    gitignore-style patterns relative to a base directory.
+
+    Supports comments, `!` negation, trailing `/` for directories only, anchoring
+    by a leading or inner `/`, and the `*`, `?`, `[...]` and `**` wildcards.
+    """
+
+    def __init__(self, patterns: list[str], base: str = ""):
+        self.base = base
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []  # (regex, negated, dir_only)
+        for line in patterns:
+            if rule := _parse_rule(line):
+                self.rules.append(rule)
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "") -> "IgnoreRules":
+        return cls(path.read_text(encoding="utf-8", errors="replace").splitlines(), base)
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """
+        Return True if ignored, False if re-included by a negation, None if no pattern matches.
+        `rel_path` is relative to the walked root; the last matching pattern wins.
+        """
+        if self.base:
+            if not rel_path.startswith(self.base):
+                return None
+            rel_path = rel_path[len(self.base):]
+
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
+class DirectoryWalker:
+    """
+    Lazily walks a directory tree with os.scandir, yielding files as they are found.
+
+    Ignored directories (VCS, dependency and cache dirs, .gitignore matches,
+    exclude patterns) are pruned without listing their contents.
+    `include` patterns, if given, restrict the yielded files. `extensions` is an
+    allow-list of suffixes or exact file names (e.g. ".py", "Dockerfile").
+    """
+
+    def __init__(
+        self,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        gitignore: bool = True,
+        ignored_dirs: tuple[str, ...] | list[str] = DEFAULT_IGNORED_DIRS,
+        max_file_size: int | None = None,
+        extensions: list[str] | None = None,
+    ):
+        self.include = IgnoreRules(include) if include else None
+        self.exclude = IgnoreRules(exclude or [])
+        self.gitignore = gitignore
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self.max_file_size = max_file_size
+        self.extensions = frozenset(ext.lower() for ext in extensions) if extensions is not None else None
+
+    def walk(self, root: Path, filter: str = MATCH_ALL) -> Iterator[Path]:
+        if not root.exists():
+            raise FileNotFoundError(f"Path does not exist: {root}")
+        if not root.is_dir():
+            raise ValueError(f"Path is not a directory: {root}")
+
+        filter_regex = _filter_regex(filter)
+        stack: list[tuple[str, str, list[IgnoreRules]]] = [(str(root), "", [self.exclude])]
+
+        while stack:
+            dir_path, rel_dir, rules = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except (PermissionError, FileNotFoundError):
+                continue
+
+            if self.gitignore and any(entry.name == ".gitignore" for entry in entries):
+                rules = [*rules, IgnoreRules.from_file(Path(dir_path) / ".gitignore", rel_dir)]
+
+            subdirs = []
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.ignored_dirs and not _is_ignored(rules, rel_path, True):
+                        subdirs.append((entry.path, rel_path + "/", rules))
+                elif entry.is_file():
+                    if _is_ignored(rules, rel_path, False):
+                        continue
+                    if self.include and not self._included(rel_path):
+                        continue
+                    if filter_regex and not filter_regex.match(rel_path):
+                        continue
+                    if reason := self._check_file(entry.name, lambda: entry.stat().st_size):
+                        record_skip(reason)
+                        continue
+                    yield Path(entry.path)
+
+            # Reversed so directories are visited in name order
+            stack.extend(reversed(subdirs))
+
+    def skip_reason(self, rel_path: str, filter: str = MATCH_ALL, size: int | None = None) -> str | None:
+        """
+        Apply the walk rules to a relative posix path that is not on disk, e.g. an archive
+        member or a remote tree entry. Returns why it is skipped: "pattern", "extension"
+        or "size", None if it is accepted. .gitignore files are not consulted.
+        """
+        parts = rel_path.split("/")
+        for i in range(1, len(parts)):
+            parent = "/".join(parts[:i])
+            if parts[i - 1] in self.ignored_dirs or _is_ignored([self.exclude], parent, True):
+                return "pattern"
+        if _is_ignored([self.exclude], rel_path, False):
+            return "pattern"
+        if self.include and not self._included(rel_path):
+            return "pattern"
+        filter_regex = _filter_regex(filter)
+        if filter_regex and not filter_regex.match(rel_path):
+            return "pattern"
+        return self._check_file(parts[-1], lambda: size or 0)
+
+    def _check_file(self, name: str, size: Callable[[], int]) -> str | None:
+        # The size is only looked up when a limit is set, since it may cost a stat call
+        if self.extensions is not None and name.lower() not in self.extensions:
+            if os.path.splitext(name)[1].lower() not in self.extensions:
+                return "extension"
+        if self.max_file_size is not None and size() > self.max_file_size:
+            return "size"
+        return None
+
+    def _included(self, rel_path: str) -> bool:
+        # A file is included if it or one of its parent directories matches
+        parts = rel_path.split("/")
+        return any(
+            self.include.match("/".join(parts[:i]), is_dir=i < len(parts))
+            for i in range(1, len(parts) + 1)
+        )
+
+
+def _is_ignored(rules: list[IgnoreRules], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for ruleset in rules:
+        if (result := ruleset.match(rel_path, is_dir)) is not None:
+            ignored = result
+    return ignored
+
+
+@functools.lru_cache(maxsize=32)
+def _filter_regex(filter: str) -> re.Pattern | None:
+    return None if filter == MATCH_ALL else re.compile(_glob_to_regex(filter, anchored=True))
+
+
+def _parse_rule(line: str) -> tuple[re.Pattern, bool, bool] | None:
+    line = line.rstrip("\n")
+    if not line.endswith("\\ "):
+        line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    return re.compile(_glob_to_regex(line, anchored)), negated, dir_only
+
+
+def _glob_to_regex(pattern: str, anchored: bool) -> str:
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif c == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif c == "?":
+            parts.append("[^/]")
+            i += 1
+        elif c == "[" and (end := pattern.find("]", i + 1)) != -1:
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+
+    body = "".join(parts)
+    return f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
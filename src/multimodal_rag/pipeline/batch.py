@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from multimodal_rag.config.schema import IndexingConfig
+from multimodal_rag.pipeline.indexer import (
+    IndexingComponents,
+    IndexOptions,
+    IndexReport,
+    run_index_pipeline,
+)
+from multimodal_rag.log_config import logger
+
+DEFAULT_MAX_PARALLEL_JOBS = 4
+
+
+class BatchJob(BaseModel):
+    source: str
+    project_id: str
+
+
+class BatchManifest(BaseModel):
+    jobs: list[BatchJob]
+
+
+class BatchReport(BaseModel):
+    jobs: list[IndexReport]
+    duration: float
+
+    @property
+    def failed(self) -> list[IndexReport]:
+        return [job for job in self.jobs if job.error]
+
+    @property
+    def documents(self) -> int:
+        return sum(job.documents for job in self.jobs)
+
+    @property
+    def chunks(self) -> int:
+        return sum(job.chunks for job in self.jobs)
+
+    def summary(self) -> dict:
+        duration = self.duration or 1e-9
+        return {
+            "jobs": len(self.jobs),
+            "failed": len(self.failed),
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "skipped": sum(job.skipped for job in self.jobs),
+            "filtered": sum(sum(job.filtered.values()) for job in self.jobs),
+            "duplicates": sum(job.duplicates for job in self.jobs),
+            "near_duplicates": sum(job.near_duplicates for job in self.jobs),
+            "saved_embedding_calls": sum(job.saved_embedding_calls for job in self.jobs),
+            "duration": self.duration,
+            "documents_per_second": round(self.documents / duration, 2),
+            "chunks_per_second": round(self.chunks / duration, 2),
+        }
+
+
+async def run_batch_index(
+    manifest: BatchManifest,
+    config: IndexingConfig,
+    options: IndexOptions | None = None,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_JOBS,
+) -> BatchReport:
+    """
+    Index many (source, project) pairs concurrently over one set of warm clients.
+    A failing job is reported and does not stop the others.
+    """
+    options = options or IndexOptions()
+    if options.journal:
+        raise ValueError("Job journaling is not supported for batch indexing")
+
+    components = IndexingComponents(config)
+    semaphore = asyncio.Semaphore(max_parallel)
+    started = time.perf_counter()
+
+    async def run_job(job: BatchJob) -> IndexReport:
+        async with semaphore:
+            logger.info("Starting batch job", extra={"source": job.source, "project_id": job.project_id})
+            try:
+                return await run_index_pipeline(job.source, config, job.project_id, options, components)
+            except Exception as e:
+                logger.exception("Batch job failed", extra={"source": job.source, "project_id": job.project_id})
+                return IndexReport(source=job.source, project_id=job.project_id, error=str(e))
+
+    try:
+        reports = await asyncio.gather(*(run_job(job) for job in manifest.jobs))
+    finally:
+        await components.close()
+
+    report = BatchReport(jobs=reports, duration=round(time.perf_counter() - started, 3))
+    logger.info("Batch indexing finished", extra=report.summary())
+    return report
@@ -0,0 +1,223 @@
+import asyncio
+import math
+import time
+from collections import Counter
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from multimodal_rag.config.schema import IndexingConfig, ProviderRateConfig
+from multimodal_rag.dedup.exact import ExactDeduplicator
+from multimodal_rag.dedup.minhash import NearDuplicateDetector
+from multimodal_rag.document import Document
+from multimodal_rag.loader.reader.extension_based import ExtensionBasedReader
+from multimodal_rag.loader.reader.parsing import create_parse_executor, parse_workers
+from multimodal_rag.loader.skips import open_skip_scope
+from multimodal_rag.preprocessor.transcriber.segmented import audio_duration, segment_count
+from multimodal_rag.chunker.registry import SplitterRegistry
+from multimodal_rag.chunker.service import ChunkerService
+from multimodal_rag.pipeline.indexer import IndexOptions, create_loader
+from multimodal_rag.pipeline.incremental import IndexManifest, IncrementalSync
+from multimodal_rag.log_config import logger
+from multimodal_rag.utils.temp_dirs import open_tmp_scope, cleanup_tmp_dirs
+from multimodal_rag.utils.timing import log_duration
+from multimodal_rag.utils.token_limit import get_tokenizer
+
+
+class FormatStats(BaseModel):
+    documents: int = 0
+    chunks: int = 0
+    characters: int = 0
+    tokens: int | None = None  # None when tiktoken is not installed
+
+
+class StageEstimate(BaseModel):
+    stage: str
+    provider: str
+    calls: int
+    tokens: int = 0
+    seconds: float
+    cost: float
+
+
+class EstimateReport(BaseModel):
+    source: str
+    formats: dict[str, FormatStats]
+    images: int
+    audio: int
+    skipped: int = 0
+    filtered: int = 0
+    duplicates: int = 0
+    near_duplicates: int = 0
+    load_and_chunk_seconds: float
+    stages: list[StageEstimate]
+
+    @property
+    def documents(self) -> int:
+        return sum(stats.documents for stats in self.formats.values())
+
+    @property
+    def chunks(self) -> int:
+        return sum(stats.chunks for stats in self.formats.values())
+
+    @property
+    def api_calls(self) -> int:
+        return sum(stage.calls for stage in self.stages)
+
+    @property
+    def seconds(self) -> float:
+        # Batch mode runs the stages one after another, so this is an upper bound for streaming mode
+        return round(self.load_and_chunk_seconds + sum(stage.seconds for stage in self.stages), 1)
+
+    @property
+    def cost(self) -> float:
+        return round(sum(stage.cost for stage in self.stages), 4)
+
+
+async def estimate_index_pipeline(
+    source: str,
+    config: IndexingConfig,
+    project_id: str,
+    options: IndexOptions | None = None,
+) -> EstimateReport:
+    """
+    Dry run: load and chunk the source for real, then project the API calls,
+    wall-clock time and cost of captioning, transcribing and embedding it.
+    Nothing is sent to paid endpoints and nothing is stored.
+    """
+    options = options or IndexOptions()
+    parse_executor = create_parse_executor(config.loading)
+    loader = create_loader(config, ExtensionBasedReader(
+        executor=parse_executor, skip_media=True, workers=parse_workers(config.loading)
+    ))
+    chunker = ChunkerService(registry=SplitterRegistry(config.chunking))
+    sync = (
+        IncrementalSync(IndexManifest.open(options.state_dir, project_id, source))
+        if options.incremental else None
+    )
+    dedup = ExactDeduplicator(sync) if config.dedup.exact else None
+    near_dedup = (
+        NearDuplicateDetector(config.dedup.near, config.embedding.batch_size or 1)
+        if config.dedup.near else None
+    )
+
+    open_tmp_scope()
+    filtered = open_skip_scope()
+    started = time.perf_counter()
+    try:
+        async with log_duration("load_documents"):
+            docs = await loader.load(source)
+        if sync:
+            docs = sync.filter(docs)
+        if dedup:
+            docs = dedup.filter(docs)
+        async with log_duration("chunk_documents", count=len(docs)):
+            await chunker.chunk_documents(docs)
+        if near_dedup:
+            async with log_duration("near_dedup_chunks", count=len(docs)):
+                for doc in docs:
+                    await near_dedup.mark(doc)
+        load_and_chunk_seconds = round(time.perf_counter() - started, 3)
+
+        async with log_duration("count_tokens"):
+            formats = await asyncio.to_thread(_format_stats, docs, config.embedding.text.model)
+        # Measured before the temp files go away
+        transcribe_calls = await _transcribe_calls(docs, config) if config.transcribing else 0
+    finally:
+        cleanup_tmp_dirs()
+        if parse_executor:
+            parse_executor.shutdown()
+
+    report = EstimateReport(
+        source=source,
+        formats=formats,
+        images=sum(1 for doc in docs if doc.source.get_modality() == "image"),
+        audio=sum(1 for doc in docs if doc.metadata.mime.startswith("audio/")),
+        skipped=sync.skipped if sync else 0,
+        filtered=sum(filtered.values()),
+        duplicates=dedup.duplicates if dedup else 0,
+        near_duplicates=near_dedup.duplicates if near_dedup else 0,
+        load_and_chunk_seconds=load_and_chunk_seconds,
+        stages=_estimate_stages(docs, formats, config, transcribe_calls),
+    )
+    logger.info("Estimated indexing", extra={
+        "documents": report.documents,
+        "chunks": report.chunks,
+        "api_calls": report.api_calls,
+        "seconds": report.seconds,
+        "cost": report.cost,
+    })
+    return report
+
+
+def _format_stats(docs: list[Document], model: str) -> dict[str, FormatStats]:
+    tokenizer = get_tokenizer(model)
+    formats: dict[str, FormatStats] = {}
+    for doc in docs:
+        stats = formats.setdefault(doc.source.parsed_format, FormatStats(tokens=0 if tokenizer else None))
+        chunks = [chunk for group in doc.chunk_groups for chunk in group.chunks]
+        stats.documents += 1
+        stats.chunks += len(chunks)
+        stats.characters += len(doc.content)
+        if tokenizer:
+            stats.tokens += sum(len(tokens) for tokens in tokenizer.encode_batch([c.content for c in chunks]))
+    return formats
+
+
+async def _transcribe_calls(docs: list[Document], config: IndexingConfig) -> int:
+    """
+    Requests of the segmented transcriber: one per segment of each audio file.
+    """
+    calls = 0
+    for doc in docs:
+        if not doc.metadata.mime.startswith("audio/"):
+            continue
+        duration = await audio_duration(Path(doc.source.tmp_uri)) if doc.source.tmp_uri else None
+        calls += segment_count(duration, config.transcribing)
+    return calls
+
+
+def _estimate_stages(
+    docs: list[Document], formats: dict[str, FormatStats], config: IndexingConfig, transcribe_calls: int = 0
+) -> list[StageEstimate]:
+    batch_size = config.embedding.batch_size or 1
+    modalities = Counter(doc.source.get_modality() for doc in docs)
+    # The embedder batches the chunks of each document separately and skips near-duplicates
+    text_calls = sum(
+        math.ceil(sum(chunk.duplicate_of is None for chunk in group.chunks) / batch_size)
+        for doc in docs
+        for group in doc.chunk_groups
+        if group.modality == "text"
+    )
+    text_tokens = sum(stats.tokens or 0 for stats in formats.values())
+
+    planned = []
+    if config.captioning and modalities["image"]:
+        # Images are captioned in batches collected across files
+        caption_calls = math.ceil(modalities["image"] / (config.captioning.batch_size or 1))
+        planned.append(("caption", config.captioning.type, caption_calls, 0))
+    if config.transcribing and transcribe_calls:
+        planned.append(("transcribe", config.transcribing.type, transcribe_calls, 0))
+    planned.append(("embed_text", config.embedding.text.type, text_calls, text_tokens))
+    if config.embedding.image and modalities["image"]:
+        planned.append(("embed_image", config.embedding.image.type, modalities["image"], 0))
+
+    return [
+        _estimate_stage(stage, provider, calls, tokens, config.estimation.rate(provider))
+        for stage, provider, calls, tokens in planned
+    ]
+
+
+def _estimate_stage(stage: str, provider: str, calls: int, tokens: int, rate: ProviderRateConfig) -> StageEstimate:
+    seconds = calls * rate.seconds_per_call / max(rate.concurrency, 1)
+    if rate.calls_per_minute:
+        seconds = max(seconds, calls / rate.calls_per_minute * 60)
+    cost = calls * rate.cost_per_call + tokens / 1_000_000 * rate.cost_per_million_tokens
+    return StageEstimate(
+        stage=stage,
+        provider=provider,
+        calls=calls,
+        tokens=tokens,
+        seconds=round(seconds, 1),
+        cost=round(cost, 4),
+    )
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from multimodal_rag.document import Document
+from multimodal_rag.loader.revisions import open_revision_scope
+from multimodal_rag.log_config import logger
+from multimodal_rag.storage.service import StorageIndexerService
+
+
+class ManifestEntry(BaseModel):
+    uuid: str
+    fingerprint: str
+    revision: str | None = None  # remote content id, e.g. the git blob SHA
+
+
+class IndexManifest:
+    """
+    Local record of the files indexed from one source into one project.
+    Maps the source-relative file path to the stored document uuid and file fingerprint.
+    `remote` keeps loader state of the last complete run, e.g. the indexed commit.
+    """
+
+    def __init__(self, path: Path, source: str):
+        self.path = path
+        self.source = source
+        self.entries: dict[str, ManifestEntry] = {}
+        self.remote: dict = {}
+
+    @classmethod
+    def open(cls, state_dir: Path, project_id: str, source: str) -> "IndexManifest":
+        source_key = normalize_source(source)
+        digest = hashlib.sha256(source_key.encode()).hexdigest()[:16]
+        manifest = cls(Path(state_dir) / "manifests" / project_id / f"{digest}.json", source_key)
+
+        if manifest.path.exists():
+            data = json.loads(manifest.path.read_text())
+            manifest.entries = {
+                path: ManifestEntry(**entry) for path, entry in data.get("entries", {}).items()
+            }
+            manifest.remote = data.get("remote", {})
+        logger.info("Opened index manifest", extra={"path": str(manifest.path), "entries": len(manifest.entries)})
+        return manifest
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "source": self.source,
+            "entries": {path: entry.model_dump() for path, entry in self.entries.items()},
+            "remote": self.remote,
+        }))
+        os.replace(tmp_path, self.path)
+
+
+class IncrementalSync:
+    """
+    Decides which loaded documents need indexing, based on the manifest of the previous run.
+
+    Unchanged files are skipped, changed files replace their previous version,
+    and files that were not seen in the current run are reported as deleted.
+    Remote loaders may leave out files they know to be unchanged; those count as seen.
+    """
+
+    def __init__(self, manifest: IndexManifest):
+        self.manifest = manifest
+        self.seen: set[str] = set()
+        self.unchanged_loaded = 0
+        self.aliases: dict[str, ManifestEntry] = {}  # copies recorded under already indexed documents
+        self.revisions = open_revision_scope(
+            {path: entry.revision for path, entry in manifest.entries.items() if entry.revision},
+            manifest.remote,
+        )
+
+    @property
+    def skipped(self) -> int:
+        return self.unchanged_loaded + len(self.revisions.unchanged)
+
+    def state(self) -> dict:
+        return {
+            "seen": sorted(self.seen),
+            "skipped": self.unchanged_loaded,
+            "revisions": self.revisions.state(),
+            "aliases": {path: entry.model_dump() for path, entry in self.aliases.items()},
+        }
+
+    def restore(self, state: dict) -> None:
+        self.seen = set(state["seen"])
+        self.unchanged_loaded = state["skipped"]
+        self.aliases = {path: ManifestEntry(**entry) for path, entry in state.get("aliases", {}).items()}
+        self.manifest.entries.update(self.aliases)
+        if "revisions" in state:
+            self.revisions.restore(state["revisions"])
+
+    def select(self, doc: Document) -> bool:
+        """
+        Register a loaded document and return True if it has to be (re-)indexed.
+        """
+        path = doc.metadata.path
+        if path is None:
+            return True
+
+        self.seen.add(path)
+        entry = self.manifest.entries.get(path)
+        if entry and entry.fingerprint == doc.metadata.fingerprint:
+            self.unchanged_loaded += 1
+            entry.revision = self.revisions.revisions.get(path, entry.revision)
+            return False
+        return True
+
+    def filter(self, docs: list[Document]) -> list[Document]:
+        selected = [doc for doc in docs if self.select(doc)]
+        logger.info("Incremental selection", extra={"selected": len(selected), "skipped": self.skipped})
+        return selected
+
+    def indexed_paths(self) -> dict[str, str]:
+        """
+        Return a path per fingerprint indexed by the previous runs.
+        """
+        return {entry.fingerprint: path for path, entry in self.manifest.entries.items()}
+
+    def add_alias(self, doc: Document, original_path: str) -> bool:
+        """
+        Record a byte-identical copy under the stored document of `original_path`.
+        Returns False if that document is not indexed with this content (yet).
+        """
+        path = doc.metadata.path
+        entry = self.manifest.entries.get(original_path)
+        if path is None or entry is None or entry.fingerprint != doc.metadata.fingerprint:
+            return False
+
+        # The entry keeps the stored document alive even if its original path changes or vanishes
+        self.aliases[path] = self.manifest.entries[path] = ManifestEntry(
+            uuid=entry.uuid,
+            fingerprint=entry.fingerprint,
+            revision=self.revisions.revisions.get(path),
+        )
+        return True
+
+    def replaced_uuids(self, docs: list[Document]) -> list[str]:
+        """
+        Return uuids of previously indexed versions of the given documents.
+        """
+        return self._orphaned_uuids({path for doc in docs for path in _doc_paths(doc)})
+
+    def vanished_paths(self) -> list[str]:
+        return [
+            path for path in self.manifest.entries
+            if path not in self.seen and path not in self.revisions.unchanged
+        ]
+
+    async def apply_imported(self, indexer: StorageIndexerService, docs: list[Document]) -> None:
+        """
+        Delete the previous versions of freshly imported documents and record them in the manifest.
+        Must be called only after the import succeeded, so a failed run never loses data.
+        """
+        replaced = self.replaced_uuids(docs)
+        await indexer.delete_documents(replaced)
+
+        paths = {path for doc in docs for path in _doc_paths(doc)}
+        previous = {self.manifest.entries[path].uuid for path in paths if path in self.manifest.entries}
+        for doc in docs:
+            # Aliases are byte-identical copies, so they share the entry of the stored document
+            for path in _doc_paths(doc):
+                self.manifest.entries[path] = ManifestEntry(
+                    uuid=doc.uuid,
+                    fingerprint=doc.metadata.fingerprint,
+                    revision=self.revisions.revisions.get(path),
+                )
+        self.manifest.save()
+        # Documents kept alive by aliases after their path got a new version
+        await self._relink(indexer, previous - set(replaced) - {doc.uuid for doc in docs})
+        logger.info("Recorded imported documents", extra={"count": len(docs), "replaced": len(replaced)})
+
+    async def apply_deletions(self, indexer: StorageIndexerService) -> None:
+        """
+        Delete documents whose files were not seen in this run. Call after the whole source was loaded.
+        """
+        vanished = self.vanished_paths()
+        deleted = self._orphaned_uuids(set(vanished))
+        await indexer.delete_documents(deleted)
+
+        kept = {self.manifest.entries[path].uuid for path in vanished} - set(deleted)
+        for path in vanished:
+            del self.manifest.entries[path]
+        if self.revisions.pending_remote is not None:
+            # Only now is everything up to the loaded revision indexed
+            self.manifest.remote = self.revisions.pending_remote
+        self.manifest.save()
+        # Documents whose path vanished while an alias is still indexed
+        await self._relink(indexer, kept)
+        logger.info("Incremental sync applied", extra={
+            "deleted": len(vanished),
+            "unchanged": self.skipped,
+            "tracked": len(self.manifest.entries),
+        })
+
+    async def _relink(self, indexer: StorageIndexerService, uuids: set[str]) -> None:
+        for uuid in sorted(uuids):
+            paths = sorted(path for path, entry in self.manifest.entries.items() if entry.uuid == uuid)
+            await indexer.set_document_paths(uuid, paths)
+
+    def _orphaned_uuids(self, paths: set[str]) -> list[str]:
+        """
+        Return uuids referenced by the given paths and by no other tracked path.
+        A document stays while any of its aliases is still indexed under it.
+        """
+        entries = self.manifest.entries
+        kept = {entry.uuid for path, entry in entries.items() if path not in paths}
+        return sorted({entries[path].uuid for path in paths if path in entries} - kept)
+
+
+def _doc_paths(doc: Document) -> list[str]:
+    return [doc.metadata.path, *doc.metadata.aliases] if doc.metadata.path else []
+
+
+def normalize_source(source: str) -> str:
+    path = Path(source)
+    return str(path.resolve()) if path.exists() else source
@@ -1,3 +1,9 @@
+import asyncio
+import time
+from pathlib import Path
+
+from pydantic import BaseModel, Field, field_validator
+
 from multimodal_rag.config.schema import IndexingConfig
 from multimodal_rag.config.factory import (
     create_transcriber,
@@ -8,70 +14,387 @@ from multimodal_rag.config.factory import (
     create_storage_client,
 )
 from multimodal_rag.loader.reader.extension_based import ExtensionBasedReader
+from multimodal_rag.loader.reader.parsing import create_parse_executor, parse_workers
 from multimodal_rag.loader.reader.registry import ReaderRegistry
 from multimodal_rag.loader.resolver import SourceResolver
 from multimodal_rag.loader.service import RecursiveLoaderService
+from multimodal_rag.loader.skips import open_skip_scope, record_skip, skip_counts
 from multimodal_rag.asset_store.writer import AssetWriterService
 from multimodal_rag.chunker.registry import SplitterRegistry
 from multimodal_rag.chunker.service import ChunkerService
 from multimodal_rag.embedder.service import EmbedderService
+from multimodal_rag.preprocessor.captioner.batcher import CaptionBatcher
+from multimodal_rag.preprocessor.transcriber.segmented import SegmentedTranscriber
+from multimodal_rag.dedup.exact import ExactDeduplicator
+from multimodal_rag.dedup.minhash import NearDuplicateDetector
+from multimodal_rag.document import Document
 from multimodal_rag.storage.service import StorageIndexerService
+from multimodal_rag.pipeline.incremental import IndexManifest, IncrementalSync
+from multimodal_rag.pipeline.journal import JobJournal
+from multimodal_rag.pipeline.streaming import StreamingIndexPipeline
+from multimodal_rag.log_config import logger
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
+from multimodal_rag.utils.image_cache import ImagePayloadCache
+from multimodal_rag.utils.temp_dirs import open_tmp_scope, set_tmp_root
 from multimodal_rag.utils.timing import log_duration
 
+DEFAULT_STATE_DIR = ".multimodal_rag"
+
+
+class IndexOptions(BaseModel):
+    incremental: bool = False
+    journal: bool = False
+    # Absolute, so a resumed job finds its manifests from any working directory
+    state_dir: Path = Field(default=Path(DEFAULT_STATE_DIR), validate_default=True)
+
+    @field_validator("state_dir")
+    @classmethod
+    def _absolute_state_dir(cls, state_dir: Path) -> Path:
+        return state_dir.expanduser().resolve()
+
+
+class IndexReport(BaseModel):
+    source: str
+    project_id: str
+    documents: int = 0
+    chunks: int = 0
+    skipped: int = 0
+    filtered: dict[str, int] = {}  # files skipped before reading or downloading, by reason
+    duplicates: int = 0
+    near_duplicates: int = 0
+    saved_embedding_calls: int = 0
+    duration: float = 0.0
+    error: str | None = None
+
+
+class IndexingComponents:
+    """
+    Clients and services for indexing with one config.
+    Project-independent, so they can be created once and shared by concurrent runs;
+    their semaphores then act as a global concurrency budget.
+    """
+
+    def __init__(self, config: IndexingConfig):
+        self.config = config
+
+        transcriber = SegmentedTranscriber(
+            create_transcriber(config.transcribing),
+            config.transcribing,
+            limiter=AdaptiveLimiter("transcriber", config.transcribing.concurrency),
+        ) if config.transcribing else None
+        captioner = CaptionBatcher(
+            create_captioner(config.captioning),
+            config.captioning,
+            limiter=AdaptiveLimiter("captioner", config.captioning.concurrency),
+        ) if config.captioning else None
+        image_cache = create_image_cache(config)
+        self.parse_executor = create_parse_executor(config.loading)
+        self.loader = create_loader(config, ExtensionBasedReader(
+            transcriber=transcriber,
+            captioner=captioner,
+            executor=self.parse_executor,
+            workers=parse_workers(config.loading),
+            caption_image_size=config.captioning.input_size if config.captioning else None,
+            image_cache=image_cache,
+            store_files=config.asset_store is not None,
+        ))
+        self.chunker = ChunkerService(registry=SplitterRegistry(config.chunking))
 
-async def run_index_pipeline(source: str, config: IndexingConfig, project_id: str) -> None:
-    transcriber = create_transcriber(config.transcribing) if config.transcribing else None
-    captioner = create_captioner(config.captioning) if config.captioning else None
-    default_reader = ExtensionBasedReader(transcriber=transcriber, captioner=captioner)
+        text_embedder = create_text_embedder(config.embedding.text)
+        image_embedder = create_image_embedder(config.embedding.image) if config.embedding.image else None
+        self.embedder = EmbedderService(
+            text_embedder,
+            image_embedder,
+            config.embedding.batch_size,
+            text_limiter=AdaptiveLimiter("text_embedder", config.embedding.text.concurrency),
+            image_limiter=(
+                AdaptiveLimiter("image_embedder", config.embedding.image.concurrency)
+                if config.embedding.image else None
+            ),
+            image_size=config.embedding.image.input_size if config.embedding.image else None,
+            image_cache=image_cache,
+        )
 
+        self.storage = create_storage_client(config.storaging)
+
+        asset_store = create_asset_store(config.asset_store) if config.asset_store else None
+        self.asset_writer = (
+            AssetWriterService(store=asset_store, limiter=AdaptiveLimiter("asset_store", config.asset_store.concurrency))
+            if asset_store else None
+        )
+
+    def indexer(self, project_id: str) -> StorageIndexerService:
+        return StorageIndexerService(self.storage, self.config, project_id)
+
+    async def close(self) -> None:
+        await self.storage.close()
+        if self.parse_executor:
+            self.parse_executor.shutdown()
+
+
+def create_image_cache(config: IndexingConfig) -> ImagePayloadCache | None:
+    """
+    Shared image payloads, if images are both captioned and embedded. They are encoded
+    at the larger of both input sizes, so one decode serves both.
+    """
+    if not config.captioning or not config.embedding.image:
+        return None
+    sizes = (config.captioning.input_size, config.embedding.image.input_size)
+    size = None if None in sizes else max(sizes)
+    return ImagePayloadCache(size, config.pipeline.image_cache_bytes)
+
+
+def create_loader(config: IndexingConfig, default_reader: ExtensionBasedReader) -> RecursiveLoaderService:
     registry = ReaderRegistry()
     registry.register(extensions=None, reader=default_reader)
+    resolver = SourceResolver(registry=registry, config=config.loading)
+    return RecursiveLoaderService(resolver)
 
-    resolver = SourceResolver(registry=registry)
-    recursive_loader = RecursiveLoaderService(resolver)
 
-    splitter_registry = SplitterRegistry(config.chunking)
-    chunker_service = ChunkerService(registry=splitter_registry)
+async def run_index_pipeline(
+    source: str,
+    config: IndexingConfig,
+    project_id: str,
+    options: IndexOptions | None = None,
+    components: IndexingComponents | None = None,
+) -> IndexReport:
+    """
+    Index a source into the project. Shared `components` are left open for the caller to close.
+    """
+    options = options or IndexOptions()
 
-    text_embedder = create_text_embedder(config.embedding.text)
-    image_embedder = create_image_embedder(config.embedding.image) if config.embedding.image else None
-    embedder_service = EmbedderService(
-        text_embedder,
-        image_embedder,
-        config.embedding.batch_size,
-    )
+    journal = None
+    if options.journal:
+        if config.pipeline.mode != "batch":
+            raise ValueError("Job journaling is supported only in batch pipeline mode")
+        journal = JobJournal.create(options.state_dir, {
+            "source": source,
+            "project_id": project_id,
+            "config": config.model_dump(mode="json"),
+            "options": options.model_dump(mode="json"),
+        })
+
+    return await _run_pipeline(source, config, project_id, options, journal, components)
+
+
+async def resume_index_pipeline(job_id: str, state_dir: Path) -> IndexReport | None:
+    """
+    Continue a journaled indexing job from its last durable point.
+    """
+    journal = JobJournal.open(state_dir, job_id)
+    if journal.get("status") == "completed":
+        logger.info("Job already completed", extra={"job_id": job_id})
+        journal.close()
+        return None
 
-    storage = create_storage_client(config.storaging)
-    indexer = StorageIndexerService(storage, config, project_id)
+    params = journal.get("params")
+    config = IndexingConfig.model_validate(params["config"])
+    options = IndexOptions.model_validate(params["options"])
+    return await _run_pipeline(params["source"], config, params["project_id"], options, journal, None)
 
-    asset_store = create_asset_store(config.asset_store) if config.asset_store else None
-    asset_storage_service = (
-        AssetWriterService(store=asset_store) if asset_store else None
+
+async def _run_pipeline(
+    source: str,
+    config: IndexingConfig,
+    project_id: str,
+    options: IndexOptions,
+    journal: JobJournal | None,
+    components: IndexingComponents | None,
+) -> IndexReport:
+    owns_components = components is None
+    components = components or IndexingComponents(config)
+    indexer = components.indexer(project_id)
+    report = IndexReport(source=source, project_id=project_id)
+    started = time.perf_counter()
+
+    # Temp dirs and skipped files of this run are tracked separately from concurrent runs
+    open_tmp_scope()
+    filtered = open_skip_scope()
+
+    sync = (
+        IncrementalSync(IndexManifest.open(options.state_dir, project_id, source))
+        if options.incremental else None
     )
+    dedup = ExactDeduplicator(sync) if config.dedup.exact else None
+    near_dedup = (
+        NearDuplicateDetector(config.dedup.near, components.embedder.batch_size)
+        if config.dedup.near else None
+    )
+
+    try:
+        if config.pipeline.mode == "streaming":
+            pipeline = StreamingIndexPipeline(
+                loader=components.loader,
+                chunker=components.chunker,
+                embedder=components.embedder,
+                indexer=indexer,
+                asset_writer=components.asset_writer,
+                config=config.pipeline,
+                sync=sync,
+                dedup=dedup,
+                near_dedup=near_dedup,
+            )
+            async with log_duration("stream_index_documents"):
+                report.documents = await pipeline.run(source)
+            report.chunks = pipeline.chunks
+        else:
+            docs = await _run_batch(
+                source, config, project_id, components, indexer, sync, dedup, near_dedup, journal
+            )
+            report.documents = len(docs)
+            report.chunks = sum(len(group.chunks) for doc in docs for group in doc.chunk_groups)
 
+        report.skipped = sync.skipped if sync else 0
+        report.filtered = dict(filtered)
+        if filtered:
+            logger.info("Filtered files before reading", extra=report.filtered)
+        report.duplicates = dedup.duplicates if dedup else 0
+        if near_dedup:
+            report.near_duplicates = near_dedup.duplicates
+            report.saved_embedding_calls = near_dedup.saved_calls
+            logger.info("Near-duplicate chunks", extra=near_dedup.stats())
+    finally:
+        report.duration = round(time.perf_counter() - started, 3)
+        if owns_components:
+            await components.close()
+
+    return report
+
+
+async def _run_batch(
+    source: str,
+    config: IndexingConfig,
+    project_id: str,
+    components: IndexingComponents,
+    indexer: StorageIndexerService,
+    sync: IncrementalSync | None,
+    dedup: ExactDeduplicator | None,
+    near_dedup: NearDuplicateDetector | None,
+    journal: JobJournal | None,
+) -> list[Document]:
+    asset_storage_service = components.asset_writer
     docs = []
+    succeeded = False
+    if journal:
+        set_tmp_root(journal.tmp_dir)
+
     try:
-        async with log_duration("load_documents"):
-            docs = await recursive_loader.load(source)
+        if journal and journal.get("loaded", False):
+            docs = journal.documents()
+            if sync:
+                sync.restore(journal.get("sync"))
+            counters = journal.get("counters", {})
+            if dedup:
+                dedup.duplicates = counters.get("duplicates", 0)
+            for reason, count in counters.get("filtered", {}).items():
+                record_skip(reason, count)
+            logger.info("Restored documents from journal", extra={"job_id": journal.job_id, "count": len(docs)})
+        else:
+            async with log_duration("load_documents"):
+                docs = await components.loader.load(source)
+
+            if sync:
+                docs = sync.filter(docs)
+            if dedup:
+                docs = dedup.filter(docs)
+
+            if journal:
+                await journal.record(docs, "loaded")
+                journal.set("sync", sync.state() if sync else None)
+                journal.set("counters", {
+                    "duplicates": dedup.duplicates if dedup else 0,
+                    "filtered": skip_counts(),
+                })
+                journal.set("loaded", True)
 
         if asset_storage_service:
+            pending = _pending(journal, docs, "stored")
             async with log_duration("store_documents"):
-                await asset_storage_service.store_documents(project_id, docs)
+                await asset_storage_service.store_documents(project_id, pending)
+            await _checkpoint(journal, pending, "stored")
+
+        pending = _pending(journal, docs, "chunked")
+        async with log_duration("chunk_documents", count=len(pending)):
+            await components.chunker.chunk_documents(pending)
+        await _checkpoint(journal, pending, "chunked")
 
-        async with log_duration("chunk_documents", count=len(docs)):
-            await chunker_service.chunk_documents(docs)
+        pending = _pending(journal, docs, "embedded")
+        if near_dedup:
+            async with log_duration("near_dedup_chunks", count=len(pending)):
+                for doc in pending:
+                    await near_dedup.mark(doc)
+            if journal:
+                # Chunks are linked again on resume, but the first pass already counted every document
+                if counted := journal.get("near_dedup"):
+                    near_dedup.duplicates = counted["near_duplicates"]
+                    near_dedup.saved_calls = counted["saved_embedding_calls"]
+                else:
+                    journal.set("near_dedup", near_dedup.stats())
 
         async with log_duration("embed_documents"):
-            await embedder_service.embed_documents(docs)
+            if journal:
+                # Documents linked to representatives of other documents are recorded once those are embedded
+                unresolved = []
 
+                async def embed_one(doc: Document) -> None:
+                    await components.embedder.embed_document(doc)
+                    if near_dedup and not near_dedup.resolve(doc):
+                        unresolved.append(doc)
+                        return
+                    await journal.record([doc], "embedded")
+
+                # Let every in-flight document finish (and get recorded) before failing
+                results = await asyncio.gather(*(embed_one(doc) for doc in pending), return_exceptions=True)
+                if errors := [r for r in results if isinstance(r, BaseException)]:
+                    raise errors[0]
+                for doc in unresolved:
+                    near_dedup.resolve(doc)
+                await journal.record(unresolved, "embedded")
+            else:
+                await components.embedder.embed_documents(pending)
+                if near_dedup:
+                    for doc in pending:
+                        near_dedup.resolve(doc)
+
+        pending = _pending(journal, docs, "imported")
         async with log_duration("ensure_collections"):
-            collections = await indexer.ensure_collections_exist(docs)
+            collections = await indexer.ensure_collections_exist(pending)
+
+        async with log_duration("import_documents", collections=len(collections), count=len(pending)):
+            if journal:
+                batch_size = config.pipeline.import_batch_size
+                for start in range(0, len(pending), batch_size):
+                    batch = pending[start:start + batch_size]
+                    await indexer.import_documents(batch, collections)
+                    await journal.record(batch, "imported")
+            else:
+                await indexer.import_documents(pending, collections)
 
-        async with log_duration("import_documents", collections=len(collections), count=len(docs)):
-            await indexer.import_documents(docs, collections)
+        if sync:
+            async with log_duration("sync_manifest"):
+                await sync.apply_imported(indexer, docs)
+                await sync.apply_deletions(indexer)
+
+        succeeded = True
+        return docs
 
     finally:
-        await indexer.storage.close()
+        if journal:
+            set_tmp_root(None)
+            journal.set("status", "completed" if succeeded else "failed")
+            journal.close()
+            if not succeeded:
+                logger.error("Indexing job interrupted, resume with --resume", extra={"job_id": journal.job_id})
 
-        if asset_storage_service and docs:
+        # Journaled jobs keep their temp files until completion so they can be resumed
+        if asset_storage_service and docs and (succeeded or not journal):
             await asset_storage_service.cleanup_tmp_files(docs)
+
+
+def _pending(journal: JobJournal | None, docs: list[Document], stage: str) -> list[Document]:
+    return journal.pending(docs, stage) if journal else docs
+
+
+async def _checkpoint(journal: JobJournal | None, docs: list[Document], stage: str) -> None:
+    if journal:
+        await journal.record(docs, stage)
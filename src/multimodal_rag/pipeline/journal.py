@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from multimodal_rag.document import Document
+from multimodal_rag.log_config import logger
+
+STAGES = ("loaded", "stored", "chunked", "embedded", "imported")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    uuid TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    tmp_uri TEXT,
+    payload TEXT NOT NULL
+);
+"""
+
+
+class JobJournal:
+    """
+    On-disk journal of an indexing job (SQLite under `<state_dir>/jobs/<job_id>`).
+
+    Records the job parameters and, for every document, the last completed stage
+    together with its full content, chunks, vectors and page offsets, so an
+    interrupted job can continue without repeating finished work. The job directory
+    is absolute, so recorded temp file paths stay valid from another working directory.
+    """
+
+    def __init__(self, job_dir: Path):
+        self.job_dir = job_dir
+        self.job_id = job_dir.name
+        self.conn = sqlite3.connect(job_dir / "journal.sqlite", check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self.stages: dict[str, str] = dict(self.conn.execute("SELECT uuid, stage FROM documents"))
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def create(cls, state_dir: Path, params: dict[str, Any]) -> "JobJournal":
+        job_dir = Path(state_dir).resolve() / "jobs" / uuid4().hex
+        job_dir.mkdir(parents=True)
+        journal = cls(job_dir)
+        journal.set("params", params)
+        journal.set("status", "running")
+        logger.info("Created indexing job", extra={"job_id": journal.job_id, "job_dir": str(job_dir)})
+        return journal
+
+    @classmethod
+    def open(cls, state_dir: Path, job_id: str) -> "JobJournal":
+        job_dir = Path(state_dir).resolve() / "jobs" / job_id
+        if not (job_dir / "journal.sqlite").exists():
+            raise FileNotFoundError(f"No journal found for job {job_id} in {job_dir}")
+        journal = cls(job_dir)
+        logger.info("Opened indexing job", extra={"job_id": job_id, "documents": len(journal.stages)})
+        return journal
+
+    @property
+    def tmp_dir(self) -> Path:
+        return self.job_dir / "tmp"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM job WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value: Any) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    def pending(self, docs: list[Document], stage: str) -> list[Document]:
+        """
+        Return documents that have not completed the given stage yet.
+        """
+        target = STAGES.index(stage)
+        return [
+            doc for doc in docs
+            if doc.uuid not in self.stages or STAGES.index(self.stages[doc.uuid]) < target
+        ]
+
+    async def record(self, docs: list[Document], stage: str) -> None:
+        """
+        Durably store the documents as having completed the given stage.
+        """
+        rows = [
+            (doc.uuid, stage, doc.source.tmp_uri, json.dumps({**doc.to_json(), "page_offsets": doc.page_offsets}))
+            for doc in docs
+        ]
+
+        def write() -> None:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO documents (uuid, stage, tmp_uri, payload) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+        async with self._lock:
+            await asyncio.to_thread(write)
+        for doc in docs:
+            self.stages[doc.uuid] = stage
+
+    def documents(self) -> list[Document]:
+        docs = []
+        for tmp_uri, payload in self.conn.execute("SELECT tmp_uri, payload FROM documents"):
+            data = json.loads(payload)
+            doc = Document.from_json(data)
+            doc.source.tmp_uri = tmp_uri
+            doc.page_offsets = data.get("page_offsets")
+            docs.append(doc)
+        return docs
+
+    def close(self) -> None:
+        self.conn.close()
@@ -42,10 +42,12 @@ async def run_rag_pipeline(
     # --- Init services ---
     text_embedder = create_text_embedder(config.embedding.text)
     image_embedder = create_image_embedder(config.embedding.image) if config.embedding.image else None
+    image_size = config.embedding.image.input_size if config.embedding.image else None
     embedder_service = EmbedderService(
         text_embedder=text_embedder,
         image_embedder=image_embedder,
         batch_size=config.embedding.batch_size or 64,
+        image_size=image_size,
     )
 
     asset_reader = AssetReaderService(stores=create_asset_stores(config.asset_store))
@@ -76,7 +78,7 @@ async def run_rag_pipeline(
 
         elif request.image_path:
             async with log_duration("retrieve_by_image", image_path=str(request.image_path), top_k=request.modality_top_k):
-                img_b64 = await load_image_base64(str(request.image_path))
+                img_b64 = await load_image_base64(str(request.image_path), image_size)
                 search_request = SearchByImage(
                     img_b64=img_b64,
                     project_id=project_id,
@@ -0,0 +1,147 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from multimodal_rag.asset_store.writer import AssetWriterService
+from multimodal_rag.chunker.service import ChunkerService
+from multimodal_rag.config.schema import PipelineConfig
+from multimodal_rag.dedup.exact import ExactDeduplicator
+from multimodal_rag.dedup.minhash import NearDuplicateDetector
+from multimodal_rag.document import Document
+from multimodal_rag.embedder.service import EmbedderService
+from multimodal_rag.loader.service import RecursiveLoaderService
+from multimodal_rag.pipeline.incremental import IncrementalSync
+from multimodal_rag.log_config import logger
+from multimodal_rag.storage.service import StorageIndexerService
+from multimodal_rag.utils.temp_dirs import cleanup_tmp_dirs
+
+_DONE = object()  # end-of-stream marker passed through the queues
+
+StageHandler = Callable[[Document], Awaitable[None]]
+
+
+class StreamingIndexPipeline:
+    """
+    Runs load -> store -> chunk -> embed -> import as concurrent stages
+    connected by bounded queues.
+
+    Documents are released as soon as their import batch is written, so peak memory
+    depends on queue size and import batch size rather than on corpus size.
+    """
+
+    def __init__(
+        self,
+        loader: RecursiveLoaderService,
+        chunker: ChunkerService,
+        embedder: EmbedderService,
+        indexer: StorageIndexerService,
+        asset_writer: AssetWriterService | None,
+        config: PipelineConfig,
+        sync: IncrementalSync | None = None,
+        dedup: ExactDeduplicator | None = None,
+        near_dedup: NearDuplicateDetector | None = None,
+    ):
+        self.loader = loader
+        self.chunker = chunker
+        self.embedder = embedder
+        self.indexer = indexer
+        self.asset_writer = asset_writer
+        self.config = config
+        self.sync = sync
+        self.dedup = dedup
+        self.near_dedup = near_dedup
+        self.loaded = 0
+        self.imported = 0
+        self.chunks = 0
+
+    async def run(self, source: str) -> int:
+        """
+        Index all documents from the source and return the number of imported documents.
+        """
+        project_id = self.indexer.project_id
+        stages: list[tuple[str, StageHandler]] = []
+
+        if self.asset_writer:
+            await self.asset_writer.ensure_storage(project_id)
+            stages.append(("store", lambda doc: self.asset_writer.store_document(project_id, doc)))
+        stages.append(("chunk", self.chunker.chunk_document))
+        if self.near_dedup:
+            # Chunks become representatives only once embedded, so a linked chunk never waits
+            stages.append(("near_dedup", lambda doc: self.near_dedup.mark(doc, register=False)))
+        stages.append(("embed", self._embed))
+
+        queues = [asyncio.Queue(maxsize=self.config.queue_size) for _ in range(len(stages) + 1)]
+
+        try:
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(self._load_stage(source, queues[0]))
+                    for (name, handler), inbox, outbox in zip(stages, queues, queues[1:]):
+                        tg.create_task(self._run_stage(name, handler, inbox, outbox))
+                    tg.create_task(self._import_stage(queues[-1]))
+            except ExceptionGroup as eg:
+                # Surface the stage failure itself; remaining stages were cancelled because of it
+                raise eg.exceptions[0]
+
+            if self.dedup:
+                for uuid, metadata in self.dedup.late_aliases.items():
+                    await self.indexer.update_document_metadata(uuid, metadata)
+            if self.sync:
+                await self.sync.apply_deletions(self.indexer)
+        finally:
+            cleanup_tmp_dirs()
+
+        logger.info("Streaming pipeline finished", extra={"loaded": self.loaded, "imported": self.imported})
+        return self.imported
+
+    async def _embed(self, doc: Document) -> None:
+        await self.embedder.embed_document(doc)
+        if self.near_dedup:
+            self.near_dedup.register(doc)
+            self.near_dedup.resolve(doc)
+
+    async def _load_stage(self, source: str, outbox: asyncio.Queue) -> None:
+        async for doc in self.loader.stream(source):
+            self.loaded += 1
+            if self.sync and not self.sync.select(doc):
+                continue
+            if self.dedup and not self.dedup.select(doc):
+                continue
+            await outbox.put(doc)
+        await outbox.put(_DONE)
+
+    async def _run_stage(
+        self, name: str, handler: StageHandler, inbox: asyncio.Queue, outbox: asyncio.Queue
+    ) -> None:
+        async def worker() -> None:
+            while (doc := await inbox.get()) is not _DONE:
+                await handler(doc)
+                await outbox.put(doc)
+            # Put the marker back so sibling workers stop as well
+            await inbox.put(_DONE)
+
+        await asyncio.gather(*(worker() for _ in range(self.config.workers)))
+        await outbox.put(_DONE)
+        logger.debug("Streaming stage finished", extra={"stage": name})
+
+    async def _import_stage(self, inbox: asyncio.Queue) -> None:
+        batch: list[Document] = []
+        while (doc := await inbox.get()) is not _DONE:
+            batch.append(doc)
+            if len(batch) >= self.config.import_batch_size:
+                await self._import_batch(batch)
+                batch = []
+
+        if batch:
+            await self._import_batch(batch)
+
+    async def _import_batch(self, batch: list[Document]) -> None:
+        if self.dedup:
+            # Before the write: copies arriving during it are rewritten afterwards
+            self.dedup.mark_imported(batch)
+        collections = await self.indexer.ensure_collections_exist(batch)
+        await self.indexer.import_documents(batch, collections)
+        if self.sync:
+            await self.sync.apply_imported(self.indexer, batch)
+        self.imported += len(batch)
+        self.chunks += sum(len(group.chunks) for doc in batch for group in doc.chunk_groups)
+        logger.info("Imported streaming batch", extra={"count": len(batch), "total": self.imported})
@@ -0,0 +1,71 @@
+import asyncio
+
+from multimodal_rag.config.schema import CaptioningConfig
+from multimodal_rag.log_config import logger
+from multimodal_rag.preprocessor.captioner.types import ImageCaptioner
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
+
+
+class CaptionBatcher(ImageCaptioner):
+    """
+    Micro-batches caption requests from concurrent callers into batched captioner calls.
+
+    Images are queued until `batch_size` of them are waiting or `batch_wait_ms` passed
+    since the first one, then sent as one request. Batches in flight are bounded by an
+    adaptive limit. A failed batch fails the callers of all its images.
+    """
+
+    def __init__(self, captioner: ImageCaptioner, config: CaptioningConfig, limiter: AdaptiveLimiter | None = None):
+        self.captioner = captioner
+        self.batch_size = config.batch_size
+        self.max_wait = config.batch_wait_ms / 1000
+        self.limiter = limiter or AdaptiveLimiter("captioner", config.concurrency)
+        self._queue: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    @property
+    def model_name(self) -> str:
+        return self.captioner.model_name
+
+    async def generate_captions(self, images: list[str]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for image in images:
+            future = loop.create_future()
+            self._queue.append((image, future))
+            futures.append(future)
+            if len(self._queue) >= self.batch_size:
+                self._flush()
+        if self._queue and self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+            task = asyncio.create_task(self._send(batch))
+            # Keep a reference, the event loop only holds weak ones
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            async with self.limiter.acquire():
+                captions = await self.captioner.generate_captions([image for image, _ in batch])
+            if len(captions) != len(batch):
+                raise RuntimeError(f"Captioner returned {len(captions)} captions for {len(batch)} images")
+        except Exception as e:
+            logger.warning("Caption batch failed", extra={"size": len(batch), "error": str(e)})
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("Captioned batch", extra={"size": len(batch)})
+        for (_, future), caption in zip(batch, captions):
+            if not future.done():
+                future.set_result(caption)
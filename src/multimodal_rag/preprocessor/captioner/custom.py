@@ -2,6 +2,8 @@ import os
 import aiohttp
 import asyncio
 from multimodal_rag.preprocessor.captioner.types import ImageCaptioner
+from multimodal_rag.log_config import logger
+from multimodal_rag.utils.loader import image_data_uri
 from multimodal_rag.utils.retry import backoff
 from aiohttp import ClientError
 from asyncio import TimeoutError
@@ -10,11 +12,15 @@ from asyncio import TimeoutError
 class CustomImageCaptioner(ImageCaptioner):
     """
     Caption generations for images using a local server API.
+
+    Several images are sent in one request to the /caption-batch endpoint. Servers
+    without it (404) get one /caption request per image from then on.
     """
 
     def __init__(self, model: str):
         self._model_name = model
         self.base_url = os.getenv("CUSTOM_CAPTIONER_BASE_URL", "http://localhost:5150")
+        self.batch_supported = True
 
     @property
     def model_name(self) -> str:
@@ -22,18 +28,37 @@ class CustomImageCaptioner(ImageCaptioner):
 
     async def generate_captions(self, images: list[str]) -> list[str]:
         async with aiohttp.ClientSession() as session:
+            if len(images) > 1 and self.batch_supported:
+                captions = await self._caption_batch(session, images)
+                if captions is not None:
+                    return captions
             tasks = [self._caption_one(session, img_b64) for img_b64 in images]
             return await asyncio.gather(*tasks)
 
+    @backoff(exception=(ClientError, TimeoutError), tries=3, delay=0.5, backoff=2)
+    async def _caption_batch(self, session: aiohttp.ClientSession, images: list[str]) -> list[str] | None:
+        url = f"{self.base_url}/caption-batch"
+
+        data = {
+            "images_base64": [image_data_uri(img_b64) for img_b64 in images],
+            "model_name": self._model_name
+        }
+
+        async with session.post(url, json=data) as response:
+            if response.status == 404:
+                logger.info("Captioner has no batch endpoint, captioning images one by one", extra={"url": url})
+                self.batch_supported = False
+                return None
+            response.raise_for_status()
+            result = await response.json()
+            return result["captions"]
+
     @backoff(exception=(ClientError, TimeoutError), tries=3, delay=0.5, backoff=2)
     async def _caption_one(self, session: aiohttp.ClientSession, img_b64: str) -> str:
         url = f"{self.base_url}/caption"
 
-        if not img_b64.startswith("data:image/"):
-            img_b64 = f"data:image/png;base64,{img_b64}"
-
         data = {
-            "image_base64": img_b64,
+            "image_base64": image_data_uri(img_b64),
             "model_name": self._model_name
         }
 
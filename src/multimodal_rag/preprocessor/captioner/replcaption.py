@@ -5,6 +5,7 @@ from asyncio import TimeoutError
 
 from multimodal_rag.embedder.replmixin import ReplicateClientMixin
 from multimodal_rag.preprocessor.captioner.types import ImageCaptioner
+from multimodal_rag.utils.loader import image_data_uri
 from multimodal_rag.utils.retry import backoff
 
 
@@ -38,13 +39,10 @@ class ReplicateImageCaptioner(ReplicateClientMixin, ImageCaptioner):
             "Content-Type": "application/json"
         }
 
-        if not img_b64.startswith("data:image/"):
-            img_b64 = f"data:image/png;base64,{img_b64}"
-
         payload = {
             "version": self._model_name,
             "input": {
-                "image": img_b64
+                "image": image_data_uri(img_b64)
             }
         }
 
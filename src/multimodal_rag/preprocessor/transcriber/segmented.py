@@ -0,0 +1,173 @@
+import asyncio
+import math
+import re
+import shutil
+import wave
+from pathlib import Path
+
+from multimodal_rag.config.schema import TranscribingConfig
+from multimodal_rag.log_config import logger
+from multimodal_rag.preprocessor.transcriber.types import AudioTranscriber
+from multimodal_rag.utils.concurrency import AdaptiveLimiter
+from multimodal_rag.utils.temp_dirs import make_tmp_dir
+
+WAV_COPY_FRAMES = 1 << 20  # frames copied per read when cutting a WAV segment
+MAX_OVERLAP_WORDS = 50  # words compared when stitching neighbouring segments
+MIN_OVERLAP_WORDS = 2  # a single repeated word may be a coincidence
+SEGMENT_SAMPLE_RATE = 16000  # mono 16 kHz, what speech models resample to anyway
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class SegmentedTranscriber(AudioTranscriber):
+    """
+    Transcribes long audio as overlapping segments, concurrently within an adaptive limit.
+
+    PCM WAV is cut with the wave module; other formats need ffmpeg on the PATH,
+    without it they are uploaded whole. Each segment is written to a temp file when
+    its turn comes and uploaded as a stream. The texts are stitched in order,
+    dropping the words repeated by the overlap. A failed segment leaves a gap and
+    is logged; the transcription fails only if every segment does.
+    """
+
+    def __init__(
+        self,
+        transcriber: AudioTranscriber,
+        config: TranscribingConfig,
+        limiter: AdaptiveLimiter | None = None,
+    ):
+        self.transcriber = transcriber
+        self.config = config
+        self.limiter = limiter or AdaptiveLimiter("transcriber", config.concurrency)
+
+    @property
+    def model_name(self) -> str:
+        return self.transcriber.model_name
+
+    async def transcribe(self, audio: bytes | Path, mime: str) -> str:
+        duration = await audio_duration(audio) if isinstance(audio, Path) else None
+        segments = segment_count(duration, self.config)
+        if segments == 1:
+            async with self.limiter.acquire():
+                return await self.transcriber.transcribe(audio, mime)
+
+        step = self.config.segment_seconds
+        length = step + self.config.overlap_seconds
+        starts = [i * step for i in range(segments)]
+        logger.debug("Transcribing audio in segments", extra={
+            "path": str(audio), "duration": round(duration, 1), "segments": len(starts),
+        })
+
+        tmp_dir = make_tmp_dir(prefix="segments_")
+        try:
+            texts = await asyncio.gather(*(
+                self._transcribe_segment(audio, tmp_dir / f"{i:05d}.wav", start, length)
+                for i, start in enumerate(starts)
+            ))
+        finally:
+            await asyncio.to_thread(shutil.rmtree, tmp_dir, True)
+
+        if all(text is None for text in texts):
+            raise RuntimeError(f"All {len(texts)} audio segments failed to transcribe")
+        return stitch_segments([text or "" for text in texts])
+
+    async def _transcribe_segment(self, source: Path, target: Path, start: float, length: float) -> str | None:
+        try:
+            # The limiter sees the error first, so overload still reduces the concurrency
+            async with self.limiter.acquire():
+                await _cut(source, target, start, length)
+                return await self.transcriber.transcribe(target, "audio/wav")
+        except Exception as e:
+            logger.warning("Failed to transcribe audio segment", extra={
+                "path": str(source), "start": start, "error": str(e),
+            })
+            return None
+        finally:
+            target.unlink(missing_ok=True)
+
+
+def stitch_segments(texts: list[str]) -> str:
+    """
+    Join segment transcripts in order. The longest run of words that ends one segment
+    and starts the next (compared case- and punctuation-insensitively) is kept once.
+    """
+    words: list[str] = []
+    for text in texts:
+        new = text.split()
+        overlap = 0
+        tail = [_normalize(word) for word in words[-MAX_OVERLAP_WORDS:]]
+        head = [_normalize(word) for word in new[:MAX_OVERLAP_WORDS]]
+        for k in range(min(len(tail), len(head)), MIN_OVERLAP_WORDS - 1, -1):
+            if tail[-k:] == head[:k]:
+                overlap = k
+                break
+        words.extend(new[overlap:])
+    return " ".join(words)
+
+
+def _normalize(word: str) -> str:
+    return "".join(_WORD_RE.findall(word.lower()))
+
+
+def segment_count(duration: float | None, config: TranscribingConfig) -> int:
+    """
+    Transcription requests for audio of this length; unknown lengths are sent whole.
+    """
+    if duration is None or duration <= config.segment_seconds + config.overlap_seconds:
+        return 1
+    return math.ceil(duration / config.segment_seconds)
+
+
+async def audio_duration(path: Path) -> float | None:
+    """
+    Length in seconds, or None if the format can't be cut here.
+    """
+    try:
+        return await asyncio.to_thread(_wav_duration, path)
+    except (wave.Error, EOFError):
+        pass
+    if not shutil.which("ffprobe"):
+        return None
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await process.communicate()
+    try:
+        return float(stdout.strip())
+    except ValueError:
+        return None
+
+
+async def _cut(source: Path, target: Path, start: float, length: float) -> None:
+    try:
+        await asyncio.to_thread(_cut_wav, source, target, start, length)
+        return
+    except (wave.Error, EOFError):
+        pass
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-v", "error", "-y", "-ss", str(start), "-t", str(length), "-i", str(source),
+        "-ac", "1", "-ar", str(SEGMENT_SAMPLE_RATE), "-f", "wav", str(target),
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise ValueError(f"ffmpeg failed to cut {source}: {stderr.decode().strip()}")
+
+
+def _wav_duration(path: Path) -> float:
+    with wave.open(str(path), "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def _cut_wav(source: Path, target: Path, start: float, length: float) -> None:
+    with wave.open(str(source), "rb") as src, wave.open(str(target), "wb") as dst:
+        dst.setparams(src.getparams())
+        rate = src.getframerate()
+        frame_size = src.getsampwidth() * src.getnchannels()
+        src.setpos(min(int(start * rate), src.getnframes()))
+        remaining = int(length * rate)
+        while remaining > 0 and (frames := src.readframes(min(remaining, WAV_COPY_FRAMES))):
+            dst.writeframes(frames)
+            remaining -= len(frames) // frame_size
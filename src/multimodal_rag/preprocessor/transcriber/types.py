@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Protocol
 
 
@@ -5,9 +6,10 @@ class AudioTranscriber(Protocol):
     """
     Interface for audio transcribing API.
     """
-    async def transcribe(self, audio_bytes: bytes, mime: str) -> str:
+    async def transcribe(self, audio: bytes | Path, mime: str) -> str:
         """
-        Transcribe audio and return the resulting text.
+        Transcribe audio and return the resulting text. A path is uploaded as a stream.
+        Raises on failure, so callers can tell an error from silence.
         """
         ...
 
@@ -92,6 +92,8 @@ class MultiModalRetriever:
                 asset_uri=doc.get("source", {}).get("asset_uri"),
                 caption=doc.get("metadata", {}).get("caption"),
                 modality=SourceConfig(**doc["source"]).get_modality(),
+                page_start=sc.chunk.page_start,
+                page_end=sc.chunk.page_end,
                 metadata=MetaConfig(**doc.get("metadata", {})),
             )
             for sc in chunk_results
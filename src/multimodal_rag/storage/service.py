@@ -1,7 +1,8 @@
 from typing import List, Union
-from multimodal_rag.document import Document
+from multimodal_rag.document import Document, MetaConfig
 from multimodal_rag.config.schema import IndexingConfig
 from multimodal_rag.storage.types import AggregateFilter, StorageClient
+from multimodal_rag.storage.utils import normalize_model_name
 from multimodal_rag.log_config import logger
 
 
@@ -85,6 +86,61 @@ class StorageIndexerService:
             await self._rollback(collection_map, uuids)
             raise
 
+    async def delete_documents(self, uuids: List[str]) -> None:
+        """
+        Delete documents and their chunks from the project collections.
+        Collections that were never created, e.g. for an unused image model, are skipped.
+        """
+        if not uuids:
+            return
+
+        document_collection = f"{self.project_id}_documents"
+        if not await self.storage.collection_exists(document_collection):
+            logger.info("No document collection, nothing to delete", extra={"collection": document_collection})
+            return
+
+        models = {self.config.embedding.text.model}
+        if self.config.embedding.image:
+            models.add(self.config.embedding.image.model)
+
+        embedding_collections = []
+        for model in sorted(models):
+            collection_name = f"{self.project_id}_embedding_{normalize_model_name(model)}"
+            if await self.storage.collection_exists(collection_name):
+                embedding_collections.append(collection_name)
+            else:
+                logger.debug("Skipping missing embedding collection", extra={"collection": collection_name})
+
+        collection_map = {"document": document_collection, "embeddings": embedding_collections}
+        await self._delete(collection_map, uuids)
+
+    async def update_document_metadata(self, uuid: str, metadata: MetaConfig) -> None:
+        await self.storage.update_by_id(
+            collection_name=f"{self.project_id}_documents",
+            field="uuid",
+            id=uuid,
+            properties={"metadata": metadata.model_dump()},
+        )
+        logger.info("Updated document metadata", extra={"doc_id": uuid, "path": metadata.path})
+
+    async def set_document_paths(self, uuid: str, paths: list[str]) -> None:
+        """
+        Make the stored document list exactly `paths`, keeping its path if it is still
+        among them and promoting an alias otherwise.
+        """
+        records = await self.storage.query_by_filter(
+            collection_name=f"{self.project_id}_documents",
+            filters={"and": [{"field": "uuid", "operator": "equal", "value": uuid}]},
+        )
+        if not records or not paths:
+            return
+
+        metadata = MetaConfig(**records[0]["metadata"])
+        path = metadata.path if metadata.path in paths else paths[0]
+        aliases = [p for p in paths if p != path]
+        if (path, aliases) != (metadata.path, metadata.aliases):
+            await self.update_document_metadata(uuid, metadata.model_copy(update={"path": path, "aliases": aliases}))
+
     async def _validate_chunks(
         self, docs: List[Document], chunk_collection: str
     ) -> None:
@@ -112,13 +168,18 @@ class StorageIndexerService:
 
     async def _rollback(
         self, collection_map: dict[str, Union[str, List[str]]], uuids: List[str]
+    ) -> None:
+        await self._delete(collection_map, uuids, action="Rolled back")
+
+    async def _delete(
+        self, collection_map: dict[str, Union[str, List[str]]], uuids: List[str], action: str = "Deleted"
     ) -> None:
         await self.storage.delete_by_ids(
             collection_name=collection_map["document"],
             field="uuid",
             ids=uuids,
         )
-        logger.info("Rolled back documents", extra={"count": len(uuids)})
+        logger.info(f"{action} documents", extra={"count": len(uuids)})
 
         for chunk_collection in collection_map["embeddings"]:
             await self.storage.delete_by_ids(
@@ -126,7 +187,7 @@ class StorageIndexerService:
                 field="doc_uuid",
                 ids=uuids,
             )
-            logger.info("Rolled back chunks", extra={"collection": chunk_collection, "count": len(uuids)})
+            logger.info(f"{action} chunks", extra={"collection": chunk_collection, "count": len(uuids)})
 
 
 def get_embedding_dim(doc: Document, modality: str) -> int | None:
@@ -15,6 +15,9 @@ class StorageClient(Protocol):
     async def close(self) -> None:
         ...
 
+    async def collection_exists(self, collection_name: str) -> bool:
+        ...
+
     async def create_document_collection(self, name: str) -> str:
         ...
 
@@ -33,6 +36,11 @@ class StorageClient(Protocol):
     ) -> None:
         ...
 
+    async def update_by_id(
+        self, collection_name: str, field: str, id: str, properties: dict
+    ) -> None:
+        ...
+
     async def delete_by_ids(
         self, collection_name: str, field: str, ids: list[str]
     ) -> None:
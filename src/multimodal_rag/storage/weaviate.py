@@ -7,6 +7,7 @@ from weaviate import (
 from weaviate.auth import AuthApiKey
 from weaviate.collections.classes.data import DataObject
 from weaviate.collections.classes.filters import Filter
+from weaviate.classes.config import DataType, Property
 from weaviate.classes.init import AdditionalConfig, Timeout
 from weaviate.classes.query import MetadataQuery
 
@@ -16,6 +17,9 @@ from multimodal_rag.storage.types import AggregateFilter, StorageClient
 from multimodal_rag.log_config import logger
 from multimodal_rag.storage.utils import normalize_model_name
 
+# Chunk properties added after the first release, migrated onto existing collections
+CHUNK_PAGE_PROPERTIES = ("page_start", "page_end")
+
 
 class WeaviateClient(StorageClient):
     def __init__(self, config: WeaviateConnectionConfig):
@@ -61,6 +65,7 @@ class WeaviateClient(StorageClient):
 
         if await client.collections.exists(collection_name):
             logger.debug("Embedding collection already exists", extra={"collection_name": collection_name})
+            await self._add_page_properties(client, collection_name)
             return collection_name
 
         await client.collections.create_from_dict({
@@ -73,7 +78,9 @@ class WeaviateClient(StorageClient):
             "properties": [
                 {"name": "content", "dataType": ["text"]},
                 {"name": "chunk_id", "dataType": ["text"]},
-                {"name": "doc_uuid", "dataType": ["text"]}
+                {"name": "doc_uuid", "dataType": ["text"]},
+                {"name": "page_start", "dataType": ["int"]},
+                {"name": "page_end", "dataType": ["int"]},
             ],
             "autoSchema": False
         })
@@ -81,6 +88,22 @@ class WeaviateClient(StorageClient):
         logger.debug("Created embedding collection", extra={"collection_name": collection_name, "dim": dim})
         return collection_name
 
+    async def _add_page_properties(self, client: WeaviateAsyncClient, collection_name: str) -> None:
+        # Chunks stored before the properties existed keep no page numbers until reindexed
+        collection = client.collections.get(collection_name)
+        config = await collection.config.get()
+        existing = {prop.name for prop in config.properties}
+        for prop in CHUNK_PAGE_PROPERTIES:
+            if prop not in existing:
+                await collection.config.add_property(Property(name=prop, data_type=DataType.INT))
+                logger.info("Added property to embedding collection", extra={
+                    "collection_name": collection_name, "property": prop,
+                })
+
+    async def collection_exists(self, collection_name: str) -> bool:
+        client = await self.get_connection()
+        return await client.collections.exists(collection_name)
+
     async def create_document_collection(self, name: str) -> str:
         client = await self.get_connection()
         collection_name = f"{name}_documents"
@@ -125,17 +148,29 @@ class WeaviateClient(StorageClient):
         for doc in documents:
             for group in doc.chunk_groups:
                 for chunk in group.chunks:
-                    objects.append(DataObject(
-                        properties={
-                            "content": chunk.content,
-                            "chunk_id": str(chunk.chunk_id),
-                            "doc_uuid": doc.uuid,
-                        },
-                        vector=chunk.embedding
-                    ))
+                    properties = {
+                        "content": chunk.content,
+                        "chunk_id": str(chunk.chunk_id),
+                        "doc_uuid": doc.uuid,
+                    }
+                    # Only paged documents set pages, so older collections keep working for the rest
+                    if chunk.page_start is not None:
+                        properties["page_start"] = chunk.page_start
+                        properties["page_end"] = chunk.page_end
+                    objects.append(DataObject(properties=properties, vector=chunk.embedding))
         await collection.data.insert_many(objects)
         logger.debug("Inserted chunks", extra={"collection": collection_name, "count": len(objects)})
 
+    async def update_by_id(self, collection_name: str, field: str, id: str, properties: dict) -> None:
+        client = await self.get_connection()
+        collection = client.collections.get(collection_name)
+
+        results = await collection.query.fetch_objects(filters=Filter.by_property(field).equal(id))
+        for obj in results.objects:
+            await collection.data.update(uuid=obj.uuid, properties=properties)
+
+        logger.debug("Updated by id", extra={"collection": collection_name, "field": field, "count": len(results.objects)})
+
     async def delete_by_ids(self, collection_name: str, field: str, ids: list[str]) -> None:
         client = await self.get_connection()
         collection = client.collections.get(collection_name)
@@ -210,6 +245,8 @@ class WeaviateClient(StorageClient):
                 chunk=Chunk(
                     chunk_id=int(obj.properties["chunk_id"]),
                     content=obj.properties["content"],
+                    page_start=obj.properties.get("page_start"),
+                    page_end=obj.properties.get("page_end"),
                 ),
                 score=obj.metadata.score,
                 doc_uuid=obj.properties["doc_uuid"]
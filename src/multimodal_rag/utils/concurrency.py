@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from multimodal_rag.config.schema import ConcurrencyConfig
+from multimodal_rag.log_config import logger
+
+_BASELINE_DRIFT = 0.01  # how fast the latency baseline follows slower observations
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one backend, adjusted with AIMD.
+
+    The limit grows by about one per round trip while latency stays within
+    `latency_tolerance` x the observed baseline, and is cut multiplicatively on
+    timeouts, 429 and 5xx responses (`backoff_ratio`) or on rising latency
+    (`latency_backoff_ratio`). At most one cut is applied per round trip.
+    With `adaptive: false` it behaves like a plain semaphore.
+    """
+
+    def __init__(self, name: str, config: ConcurrencyConfig | None = None):
+        self.name = name
+        self.config = config or ConcurrencyConfig()
+        self.limit = float(min(max(self.config.initial, self.config.min), self.config.max))
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @classmethod
+    def fixed(cls, name: str, limit: int) -> "AdaptiveLimiter":
+        return cls(name, ConcurrencyConfig(initial=limit, min=limit, max=limit, adaptive=False))
+
+    @property
+    def max_limit(self) -> int:
+        return self.config.max
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_overload(e):
+                self._decrease(started, self.config.backoff_ratio, reason=type(e).__name__)
+            raise
+        else:
+            self._on_success(time.monotonic() - started, started)
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    async def _acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Cancelled after being woken: hand the free slot to the next waiter
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _on_success(self, latency: float, started: float) -> None:
+        if not self.config.adaptive:
+            return
+
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += (latency - self.baseline) * _BASELINE_DRIFT
+
+        if latency > self.baseline * self.config.latency_tolerance:
+            self._decrease(started, self.config.latency_backoff_ratio, reason="latency")
+        elif self.in_flight >= int(self.limit):
+            # Only grow while the current limit is actually used
+            self._set_limit(self.limit + 1 / self.limit)
+
+    def _decrease(self, started: float, ratio: float, reason: str) -> None:
+        # Requests started before the last cut saw the old limit; don't cut again for them
+        if not self.config.adaptive or started < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self._set_limit(self.limit * ratio, reason)
+
+    def _set_limit(self, limit: float, reason: str | None = None) -> None:
+        previous = int(self.limit)
+        self.limit = min(max(limit, self.config.min), self.config.max)
+        if int(self.limit) != previous:
+            logger.debug("Concurrency limit changed", extra={
+                "backend": self.name,
+                "limit": int(self.limit),
+                "previous": previous,
+                "reason": reason or "growth",
+            })
+        self._wake()
+
+
+def is_overload(e: BaseException) -> bool:
+    """
+    True for errors that signal an overloaded backend: timeouts, 429 and 5xx responses.
+    """
+    if isinstance(e, TimeoutError):
+        return True
+    status = getattr(e, "status", None)
+    response = getattr(e, "response", None)
+    if status is None and isinstance(response, dict):
+        # botocore ClientError
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return isinstance(status, int) and (status == 429 or status >= 500)
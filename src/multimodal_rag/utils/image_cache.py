@@ -0,0 +1,71 @@
+import asyncio
+from collections import OrderedDict
+
+from multimodal_rag.log_config import logger
+from multimodal_rag.utils.loader import load_image_base64
+
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+
+class ImagePayloadCache:
+    """
+    In-run LRU cache of preprocessed image payloads (base64), keyed by file fingerprint.
+
+    Captioning and embedding of the same image share one read, decode and encode;
+    concurrent requests for an image being encoded wait for the same load, which
+    finishes even if the request that started it is cancelled.
+    Payloads are encoded at `size`, so it should be the largest input size of the consumers.
+    Least recently used payloads are evicted above `max_bytes`.
+    """
+
+    def __init__(self, size: int | None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+
+    async def get(self, fingerprint: str, path: str) -> str:
+        if (payload := self._entries.get(fingerprint)) is not None:
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return payload
+        if (loading := self._loading.get(fingerprint)) is not None:
+            self.hits += 1
+        else:
+            # Loaded in its own task, so a cancelled first caller doesn't cancel the other waiters
+            self.misses += 1
+            loading = asyncio.ensure_future(self._load(fingerprint, path))
+            loading.add_done_callback(_retrieve_exception)
+            self._loading[fingerprint] = loading
+        return await asyncio.shield(loading)
+
+    async def _load(self, fingerprint: str, path: str) -> str:
+        try:
+            payload = await load_image_base64(path, self.size)
+            self._put(fingerprint, payload)
+            return payload
+        finally:
+            del self._loading[fingerprint]
+
+    def _put(self, fingerprint: str, payload: str) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[fingerprint] = payload
+        self.total_bytes += len(payload)
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+        logger.debug("Cached image payload", extra={
+            "fingerprint": fingerprint[:16],
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+        })
+
+
+def _retrieve_exception(task: asyncio.Future) -> None:
+    # Marks a failed load as retrieved even if all of its waiters were cancelled
+    if not task.cancelled():
+        task.exception()
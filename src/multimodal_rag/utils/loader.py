@@ -1,24 +1,104 @@
 import io
+import os
 import base64
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageOps
 
+JPEG_QUALITY = 90
+BACKGROUND = (255, 255, 255)  # transparent areas are flattened onto white, JPEG has no alpha
+PASSTHROUGH_FORMATS = {"JPEG", "PNG"}  # sent as-is when no resize or conversion is needed
+PASSTHROUGH_MODES = {"RGB", "L"}
+IMAGE_WORKERS = min(8, os.cpu_count() or 1)
 
-async def load_image_base64(path: str, format: str = "PNG") -> str:
-    image = await load_file(path)
-    return await asyncio.to_thread(image_bytes_to_base64, image, format)
+# base64 prefixes of the image signatures, for labelling payloads without decoding them
+_B64_MIME_PREFIXES = {
+    "/9j/": "image/jpeg",
+    "iVBORw0KGgo": "image/png",
+    "UklGR": "image/webp",
+    "R0lGOD": "image/gif",
+}
 
+_image_pool: ThreadPoolExecutor | None = None
+
+
+async def load_image_base64(path: str, size: int | None = None) -> str:
+    return await encode_image_async(await load_file(path), size)
+
+
+async def encode_image_async(data: bytes, size: int | None = None) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_image_pool(), encode_image, data, size)
+
+
+def encode_image(data: bytes, size: int | None = None) -> str:
+    """
+    Base64 payload of an image for captioners, embedders and generators, scaled down
+    so its shorter side is `size` (models resize the shorter side to their input size).
+    JPEG is decoded at a reduced scale right away (draft mode), and the result is an
+    RGB JPEG, with transparency flattened onto white. RGB or greyscale JPEG and PNG
+    images that need no resize are passed through without re-encoding.
+    """
+    image = Image.open(io.BytesIO(data))
+    target = _target_size(image.size, size)
+    upright = image.getexif().get(0x0112, 1) == 1  # EXIF orientation tag
+    if upright and image.format in PASSTHROUGH_FORMATS and image.mode in PASSTHROUGH_MODES and target is None:
+        return base64.b64encode(data).decode()
+
+    if target:
+        # Decodes JPEG at 1/2, 1/4 or 1/8 scale, still at least the target size
+        image.draft("RGB", target)
+    image = _flatten(image)
+    if target:
+        image = image.resize(target, Image.Resampling.BICUBIC, reducing_gap=2.0)
+    image = ImageOps.exif_transpose(image)
 
-def image_bytes_to_base64(data: bytes, format: str = "PNG") -> str:
-    image = Image.open(io.BytesIO(data)).convert("RGB")
     buffer = io.BytesIO()
-    image.save(buffer, format=format)
+    image.save(buffer, format="JPEG", quality=JPEG_QUALITY)
     return base64.b64encode(buffer.getvalue()).decode()
 
 
+def image_data_uri(img_b64: str) -> str:
+    """
+    Data URI for a base64 image payload, labelled with its actual format.
+    """
+    if img_b64.startswith("data:image/"):
+        return img_b64
+    mime = next((m for prefix, m in _B64_MIME_PREFIXES.items() if img_b64.startswith(prefix)), "image/png")
+    return f"data:{mime};base64,{img_b64}"
+
+
 async def load_file(path: str) -> bytes:
     path = Path(path.removeprefix("file://"))
     if not path.exists():
         raise FileNotFoundError(f"File not found at {path}")
     return await asyncio.to_thread(path.read_bytes)
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """
+    RGB version of an image, with alpha and transparent palette entries composited onto BACKGROUND.
+    """
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, BACKGROUND)
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _target_size(current: tuple[int, int], size: int | None) -> tuple[int, int] | None:
+    width, height = current
+    if not size or min(width, height) <= size:
+        return None
+    scale = size / min(width, height)
+    return max(round(width * scale), 1), max(round(height * scale), 1)
+
+
+def _get_image_pool() -> ThreadPoolExecutor:
+    # Decoding and resizing release the GIL; a dedicated pool keeps them off the default executor
+    global _image_pool
+    if _image_pool is None:
+        _image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image")
+    return _image_pool
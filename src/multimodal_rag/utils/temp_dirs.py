@@ -1,21 +1,49 @@
+from contextvars import ContextVar
 from pathlib import Path
 import tempfile
 import shutil
 
 _tmp_dirs: set[Path] = set()
+_tmp_scope: ContextVar[set[Path] | None] = ContextVar("tmp_scope", default=None)
+_tmp_root: Path | None = None
+
+
+def set_tmp_root(root: Path | None) -> None:
+    """
+    Create subsequent temp dirs under the given root instead of the system temp dir.
+    """
+    global _tmp_root
+    if root is not None:
+        root.mkdir(parents=True, exist_ok=True)
+    _tmp_root = root
 
 
 def make_tmp_dir(*, prefix: str = "tmp", suffix: str = "", dir: str | None = None) -> Path:
+    if dir is None and _tmp_root is not None:
+        dir = str(_tmp_root)
     path = Path(tempfile.mkdtemp(prefix=prefix, suffix=suffix, dir=dir))
     _tmp_dirs.add(path)
+    if (scope := _tmp_scope.get()) is not None:
+        scope.add(path)
     return path
 
 
+def open_tmp_scope() -> None:
+    """
+    Track temp dirs created from the current task (and the tasks it spawns) separately,
+    so `cleanup_tmp_dirs` only removes those. Lets concurrent pipeline runs clean up independently.
+    """
+    _tmp_scope.set(set())
+
+
 def get_tmp_dirs() -> set[Path]:
     return _tmp_dirs.copy()
 
 
 def cleanup_tmp_dirs() -> None:
-    for path in get_tmp_dirs():
+    scope = _tmp_scope.get()
+    paths = scope if scope is not None else _tmp_dirs
+    for path in list(paths):
         shutil.rmtree(path, ignore_errors=True)
-    _tmp_dirs.clear()
+        _tmp_dirs.discard(path)
+    paths.clear()
@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+import pytest
+
+from multimodal_rag.document import Chunk, ChunkGroup, Document, MetaConfig, SourceConfig
+
+
+def make_doc(path: str, fingerprint: str, content: str = "", chunks: list[str] | None = None) -> Document:
+    return Document(
+        uuid=str(uuid4()),
+        content=content,
+        lang="en",
+        source=SourceConfig(file_reader="extension_based", parsed_format="text"),
+        metadata=MetaConfig(
+            filename=path.rsplit("/", 1)[-1],
+            size_bytes=len(content),
+            last_modified=0,
+            fingerprint=fingerprint,
+            mime="text/plain",
+            path=path,
+        ),
+        chunk_groups=[ChunkGroup(
+            chunks=[Chunk(chunk_id=i, content=text) for i, text in enumerate(chunks)],
+            embedder_name="test",
+            modality="text",
+        )] if chunks else [],
+    )
+
+
+class FakeIndexer:
+    """
+    Records what the incremental sync asks the storage service to change.
+    """
+
+    def __init__(self):
+        self.deleted: list[str] = []
+        self.paths: dict[str, list[str]] = {}
+
+    async def delete_documents(self, uuids: list[str]) -> None:
+        self.deleted.extend(uuids)
+
+    async def set_document_paths(self, uuid: str, paths: list[str]) -> None:
+        self.paths[uuid] = paths
+
+
+@pytest.fixture
+def indexer() -> FakeIndexer:
+    return FakeIndexer()
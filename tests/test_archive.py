@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from multimodal_rag.config.schema import ArchiveConfig
+from multimodal_rag.loader.archive import _RATIO_GRACE_BYTES, _MemberGuard, _normalize_name
+
+
+def test_member_count_limit():
+    guard = _MemberGuard(ArchiveConfig(max_members=2), lambda: 1)
+    guard.check_member("a", 1)
+    guard.check_member("b", 1)
+    with pytest.raises(ValueError, match="more than 2 members"):
+        guard.check_member("c", 1)
+
+
+def test_declared_member_size_limit():
+    guard = _MemberGuard(ArchiveConfig(max_member_size=10), lambda: 1)
+    with pytest.raises(ValueError, match="exceeds 10 bytes"):
+        guard.check_member("big", 11)
+
+
+def test_read_is_capped_regardless_of_declared_size():
+    guard = _MemberGuard(ArchiveConfig(max_member_size=10), lambda: 1)
+    assert guard.read_capped(io.BytesIO(b"x" * 10), "fits") == b"x" * 10
+    with pytest.raises(ValueError, match="exceeds 10 bytes"):
+        guard.read_capped(io.BytesIO(b"x" * 11), "lying")
+
+
+def test_total_size_limit():
+    guard = _MemberGuard(ArchiveConfig(max_total_size=100), lambda: 100)
+    guard.account(60)
+    with pytest.raises(ValueError, match="exceeds 100 bytes"):
+        guard.account(41)
+
+
+def test_compression_ratio_limit_after_grace():
+    guard = _MemberGuard(ArchiveConfig(max_ratio=10), lambda: 1024)
+    guard.account(_RATIO_GRACE_BYTES)  # small archives may compress arbitrarily well
+    with pytest.raises(ValueError, match="compression ratio"):
+        guard.account(1)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("dir/file.txt", "dir/file.txt"),
+    ("./dir//file.txt", "dir/file.txt"),
+    ("/abs/file.txt", "abs/file.txt"),
+    ("dir\\file.txt", "dir/file.txt"),
+    ("../evil.txt", None),
+    ("dir/../../evil.txt", None),
+    ("", None),
+])
+def test_member_names_stay_inside_the_archive(name, expected):
+    assert _normalize_name(name) == expected
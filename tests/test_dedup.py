@@ -0,0 +1,73 @@
+import asyncio
+
+from conftest import make_doc
+from multimodal_rag.config.schema import NearDedupConfig
+from multimodal_rag.dedup.exact import ExactDeduplicator
+from multimodal_rag.dedup.minhash import NearDuplicateDetector
+
+TEXT = "the quick brown fox jumps over the lazy dog while the cat sleeps on the warm mat by the door"
+
+
+def test_exact_duplicates_become_aliases():
+    dedup = ExactDeduplicator()
+    original, copy, other = make_doc("a.txt", "same"), make_doc("dir/b.txt", "same"), make_doc("c.txt", "other")
+
+    assert dedup.filter([original, copy, other]) == [original, other]
+    assert original.metadata.aliases == ["dir/b.txt"]
+    assert dedup.duplicates == 1
+
+
+def test_copy_after_import_is_a_late_alias():
+    dedup = ExactDeduplicator()
+    original = make_doc("a.txt", "same")
+    dedup.select(original)
+    dedup.mark_imported([original])
+
+    assert not dedup.select(make_doc("b.txt", "same"))
+    assert dedup.late_aliases == {original.uuid: original.metadata}
+    assert original.metadata.aliases == ["b.txt"]
+
+
+def test_near_duplicate_reuses_representative_embedding():
+    detector = NearDuplicateDetector(NearDedupConfig(), batch_size=8)
+    first = make_doc("a.txt", "fa", chunks=[TEXT])
+    second = make_doc("b.txt", "fb", chunks=[TEXT + " today"])
+    asyncio.run(detector.mark(first))
+    asyncio.run(detector.mark(second))
+
+    duplicate = second.chunk_groups[0].chunks[0]
+    assert detector.duplicates == 1
+    assert duplicate.duplicate_of is not None
+    assert not detector.resolve(second)
+
+    first.chunk_groups[0].chunks[0].embedding = [0.5, 0.25]
+    assert detector.resolve(second)
+    assert duplicate.embedding == [0.5, 0.25]
+
+
+def test_distinct_chunks_are_kept():
+    detector = NearDuplicateDetector(NearDedupConfig(), batch_size=8)
+    doc = make_doc("a.txt", "fa", chunks=[TEXT, "completely different words describe another topic entirely here"])
+    asyncio.run(detector.mark(doc))
+
+    assert detector.duplicates == 0
+    assert all(chunk.duplicate_of is None for chunk in doc.chunk_groups[0].chunks)
+
+
+def test_drop_action_removes_near_duplicates():
+    detector = NearDuplicateDetector(NearDedupConfig(action="drop"), batch_size=1)
+    doc = make_doc("a.txt", "fa", chunks=[TEXT, TEXT + " today"])
+    asyncio.run(detector.mark(doc))
+
+    assert [chunk.content for chunk in doc.chunk_groups[0].chunks] == [TEXT]
+    assert detector.saved_calls == 1
+
+
+def test_representatives_are_capped():
+    detector = NearDuplicateDetector(NearDedupConfig(max_representatives=2), batch_size=8)
+    doc = make_doc("a.txt", "fa", chunks=[f"{i} unrelated sentence number {i} about topic {i * 7}" for i in range(5)])
+    asyncio.run(detector.mark(doc))
+
+    assert len(detector.representatives) == 2
+    kept = set(map(id, detector.representatives.values()))
+    assert all(id(rep) in kept for bucket in detector.buckets for rep in bucket.values())
@@ -0,0 +1,86 @@
+import asyncio
+
+from conftest import make_doc
+from multimodal_rag.dedup.exact import ExactDeduplicator
+from multimodal_rag.pipeline.incremental import IncrementalSync, IndexManifest
+
+
+def run_once(state_dir, docs, indexer) -> IncrementalSync:
+    # Mirrors the pipeline: incremental selection, exact dedup, import, then deletions
+    sync = IncrementalSync(IndexManifest.open(state_dir, "project", "source"))
+    selected = ExactDeduplicator(sync).filter(sync.filter(docs))
+    if selected:
+        asyncio.run(sync.apply_imported(indexer, selected))
+    asyncio.run(sync.apply_deletions(indexer))
+    return sync
+
+
+def test_first_run_records_every_file(tmp_path, indexer):
+    docs = [make_doc("a.txt", "fa"), make_doc("b.txt", "fb")]
+    sync = run_once(tmp_path, docs, indexer)
+
+    manifest = IndexManifest.open(tmp_path, "project", "source")
+    assert {path: entry.uuid for path, entry in manifest.entries.items()} == {
+        "a.txt": docs[0].uuid, "b.txt": docs[1].uuid,
+    }
+    assert sync.skipped == 0
+    assert indexer.deleted == []
+
+
+def test_unchanged_files_are_skipped(tmp_path, indexer):
+    run_once(tmp_path, [make_doc("a.txt", "fa")], indexer)
+
+    sync = IncrementalSync(IndexManifest.open(tmp_path, "project", "source"))
+    assert sync.filter([make_doc("a.txt", "fa")]) == []
+    assert sync.skipped == 1
+
+
+def test_changed_file_replaces_previous_version(tmp_path, indexer):
+    old = make_doc("a.txt", "v1")
+    run_once(tmp_path, [old], indexer)
+
+    new = make_doc("a.txt", "v2")
+    sync = run_once(tmp_path, [new], indexer)
+
+    assert indexer.deleted == [old.uuid]
+    assert sync.manifest.entries["a.txt"].uuid == new.uuid
+    assert sync.manifest.entries["a.txt"].fingerprint == "v2"
+
+
+def test_vanished_file_is_deleted(tmp_path, indexer):
+    kept, gone = make_doc("a.txt", "fa"), make_doc("b.txt", "fb")
+    run_once(tmp_path, [kept, gone], indexer)
+
+    sync = run_once(tmp_path, [make_doc("a.txt", "fa")], indexer)
+
+    assert indexer.deleted == [gone.uuid]
+    assert set(sync.manifest.entries) == {"a.txt"}
+
+
+def test_alias_keeps_document_when_original_vanishes(tmp_path, indexer):
+    doc = make_doc("a.txt", "same")
+    run_once(tmp_path, [doc, make_doc("b.txt", "same")], indexer)
+    assert doc.metadata.aliases == ["b.txt"]
+
+    sync = run_once(tmp_path, [make_doc("b.txt", "same")], indexer)
+
+    assert indexer.deleted == []
+    assert indexer.paths == {doc.uuid: ["b.txt"]}
+    assert sync.manifest.entries["b.txt"].uuid == doc.uuid
+
+
+def test_copy_of_indexed_file_becomes_alias(tmp_path, indexer):
+    doc = make_doc("a.txt", "same")
+    run_once(tmp_path, [doc], indexer)
+
+    sync = run_once(tmp_path, [make_doc("a.txt", "same"), make_doc("b.txt", "same")], indexer)
+
+    assert sync.manifest.entries["b.txt"].uuid == doc.uuid
+    assert indexer.deleted == []
+
+
+def test_manifests_are_separate_per_project_and_source(tmp_path, indexer):
+    run_once(tmp_path, [make_doc("a.txt", "fa")], indexer)
+
+    assert IndexManifest.open(tmp_path, "other", "source").entries == {}
+    assert IndexManifest.open(tmp_path, "project", "other").entries == {}
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from conftest import make_doc
+from multimodal_rag.pipeline.incremental import IncrementalSync, IndexManifest
+from multimodal_rag.pipeline.journal import JobJournal
+
+
+def test_resume_returns_documents_with_their_last_stage(tmp_path):
+    journal = JobJournal.create(tmp_path, {"source": "src"})
+    chunked = make_doc("a.txt", "fa", content="first page\nsecond", chunks=["first page", "second"])
+    chunked.source.tmp_uri = "/tmp/a.txt"
+    chunked.page_offsets = [0, 11]
+    loaded = make_doc("b.txt", "fb", content="b")
+    asyncio.run(journal.record([chunked, loaded], "loaded"))
+    asyncio.run(journal.record([chunked], "chunked"))
+    journal.close()
+
+    resumed = JobJournal.open(tmp_path, journal.job_id)
+    docs = {doc.uuid: doc for doc in resumed.documents()}
+
+    assert resumed.get("params") == {"source": "src"}
+    assert resumed.stages == {chunked.uuid: "chunked", loaded.uuid: "loaded"}
+    assert [doc.uuid for doc in resumed.pending(list(docs.values()), "chunked")] == [loaded.uuid]
+    assert resumed.pending(list(docs.values()), "embedded") != []
+
+    restored = docs[chunked.uuid]
+    assert restored.source.tmp_uri == "/tmp/a.txt"
+    assert restored.page_offsets == [0, 11]
+    assert [chunk.content for chunk in restored.chunk_groups[0].chunks] == ["first page", "second"]
+    resumed.close()
+
+
+def test_open_unknown_job_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        JobJournal.open(tmp_path, "missing")
+
+
+def test_sync_state_survives_resume(tmp_path):
+    sync = IncrementalSync(IndexManifest.open(tmp_path, "project", "source"))
+    sync.select(make_doc("a.txt", "fa"))
+    state = sync.state()
+
+    resumed = IncrementalSync(IndexManifest.open(tmp_path, "project", "source"))
+    resumed.restore(state)
+
+    assert resumed.seen == {"a.txt"}
+    assert resumed.vanished_paths() == []
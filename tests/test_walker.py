@@ -0,0 +1,65 @@
+import pytest
+
+from multimodal_rag.loader.walker import DirectoryWalker, IgnoreRules
+
+
+@pytest.mark.parametrize("patterns, path, is_dir, expected", [
+    (["*.log"], "a/b/debug.log", False, True),
+    (["/build"], "build", True, True),
+    (["/build"], "src/build", True, None),
+    (["docs/*.md"], "docs/readme.md", False, True),
+    (["docs/*.md"], "docs/sub/readme.md", False, None),
+    (["**/tmp"], "a/b/tmp", True, True),
+    (["out/"], "out", False, None),
+    (["out/"], "out", True, True),
+    (["*.log", "!keep.log"], "keep.log", False, False),
+    (["file?.txt"], "file1.txt", False, True),
+    (["file[0-9].txt"], "filea.txt", False, None),
+    (["# comment", ""], "comment", False, None),
+])
+def test_ignore_rules(patterns, path, is_dir, expected):
+    assert IgnoreRules(patterns).match(path, is_dir) is expected
+
+
+def test_rules_are_relative_to_their_base():
+    rules = IgnoreRules(["/generated"], base="pkg/")
+    assert rules.match("pkg/generated", True) is True
+    assert rules.match("generated", True) is None
+
+
+def walked(root, walker, filter="**/*"):
+    return sorted(path.relative_to(root).as_posix() for path in walker.walk(root, filter))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ["a.py", "b.md", "src/c.py", "src/d.min.js", "node_modules/x.js", "logs/app.log", "big.py"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x" * (100 if name == "big.py" else 1))
+    (tmp_path / ".gitignore").write_text("logs/\n")
+    (tmp_path / "src" / ".gitignore").write_text("*.min.js\n")
+    return tmp_path
+
+
+def test_walk_prunes_ignored_dirs_and_gitignore(tree):
+    assert walked(tree, DirectoryWalker()) == [".gitignore", "a.py", "b.md", "big.py", "src/.gitignore", "src/c.py"]
+
+
+def test_walk_include_exclude_extensions_and_size(tree):
+    assert walked(tree, DirectoryWalker(include=["src/"], gitignore=False)) == [
+        "src/.gitignore", "src/c.py", "src/d.min.js",
+    ]
+    assert walked(tree, DirectoryWalker(exclude=["src"], extensions=[".py"])) == ["a.py", "big.py"]
+    assert walked(tree, DirectoryWalker(extensions=[".py"], max_file_size=10)) == ["a.py", "src/c.py"]
+    assert walked(tree, DirectoryWalker(), filter="**/*.py") == ["a.py", "big.py", "src/c.py"]
+
+
+def test_skip_reason_applies_the_walk_rules_to_relative_paths():
+    walker = DirectoryWalker(exclude=["*.min.js"], extensions=[".py", ".js"], max_file_size=10)
+    assert walker.skip_reason("src/a.py", size=5) is None
+    assert walker.skip_reason("node_modules/lib/a.js") == "pattern"
+    assert walker.skip_reason("src/app.min.js") == "pattern"
+    assert walker.skip_reason("src/a.py", filter="docs/**") == "pattern"
+    assert walker.skip_reason("README.md") == "extension"
+    assert walker.skip_reason("src/a.py", size=11) == "size"